@@ -0,0 +1,136 @@
+"""
+Shared aggregation core for the incremental analysis features.
+
+Mirrors the contract of analyze_regional_sales and analyze_product_performance
+in skeleton.py (validation, totals and labels) so that cached totals can be
+updated cell by cell instead of re-aggregating sales_data on every change.
+"""
+
+import math
+
+HIGHEST_REGION_LABEL = "Highest performing region"
+LOWEST_REGION_LABEL = "Lowest performing region"
+TOP_PRODUCT_LABEL = "Top product"
+BOTTOM_PRODUCT_LABEL = "Bottom product"
+
+
+def validate_amount(amount):
+    """Raise the same errors as the analysis functions for a bad sales amount"""
+    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+        raise TypeError(f"Sales amount must be a number, got {type(amount).__name__}")
+    if isinstance(amount, float) and not math.isfinite(amount):
+        raise ValueError(f"Sales amount must be finite, got {amount}")
+    if amount < 0:
+        raise ValueError(f"Sales amount cannot be negative, got {amount}")
+    return amount
+
+
+def label_regions(region_totals):
+    """
+    Turn {region: total} into {region: (total, label)}
+    The first region reaching the highest/lowest total gets the label
+    """
+    highest_region = None
+    lowest_region = None
+    for region, total in region_totals.items():
+        if highest_region is None or total > region_totals[highest_region]:
+            highest_region = region
+        if lowest_region is None or total < region_totals[lowest_region]:
+            lowest_region = region
+
+    regional_analysis = {}
+    for region, total in region_totals.items():
+        label = ""
+        if region == highest_region:
+            label = HIGHEST_REGION_LABEL
+        elif region == lowest_region:
+            label = LOWEST_REGION_LABEL
+        regional_analysis[region] = (total, label)
+    return regional_analysis
+
+
+def label_products(product_totals):
+    """
+    Turn {product: total} into {product: (total, label)} ordered from
+    highest to lowest total, labelling the first and last entries
+    """
+    ranked = sorted(product_totals.items(), key=lambda x: x[1], reverse=True)
+    result = {}
+    last_index = len(ranked) - 1
+    for index, (product, total) in enumerate(ranked):
+        label = ""
+        if index == 0:
+            label = TOP_PRODUCT_LABEL
+        elif index == last_index:
+            label = BOTTOM_PRODUCT_LABEL
+        result[product] = (total, label)
+    return result
+
+
+class SalesTotals:
+    """
+    Cached regional and product totals that accept per-cell deltas
+
+    Cells are keyed by (region, product); setting a cell applies only the
+    difference against its previous amount to the cached totals.
+    """
+
+    def __init__(self, sales_data=None):
+        self.cells = {}
+        self.region_totals = {}
+        self.product_totals = {}
+        self._product_cells = {}
+        if sales_data is not None:
+            self.load(sales_data)
+
+    def load(self, sales_data):
+        """Add every cell of a nested {region: {product: amount}} dict"""
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        for region, products in sales_data.items():
+            self.cells.setdefault(region, {})
+            self.region_totals.setdefault(region, 0)
+            for product, amount in products.items():
+                self.set_amount(region, product, amount)
+
+    def set_amount(self, region, product, amount):
+        """Store a cell amount and return the delta applied to the totals"""
+        validate_amount(amount)
+        row = self.cells.setdefault(region, {})
+        previous = row.get(product)
+        row[product] = amount
+        if previous is None:
+            delta = amount
+            self.product_totals[product] = self.product_totals.get(product, 0) + amount
+            self._product_cells[product] = self._product_cells.get(product, 0) + 1
+        else:
+            delta = amount - previous
+            self.product_totals[product] += delta
+        self.region_totals[region] = self.region_totals.get(region, 0) + delta
+        return delta
+
+    def remove_amount(self, region, product):
+        """Drop a cell and subtract its amount from the totals"""
+        row = self.cells.get(region)
+        if row is None or product not in row:
+            raise KeyError((region, product))
+        amount = row.pop(product)
+        self.region_totals[region] -= amount
+        self.product_totals[product] -= amount
+        self._product_cells[product] -= 1
+        if not self._product_cells[product]:
+            del self._product_cells[product]
+            del self.product_totals[product]
+        return amount
+
+    def to_sales_data(self):
+        """Return a copy of the cells in the nested sales_data layout"""
+        return {region: dict(products) for region, products in self.cells.items()}
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales"""
+        return label_regions(self.region_totals)
+
+    def product_results(self):
+        """Same shape as analyze_product_performance"""
+        return label_products(self.product_totals)
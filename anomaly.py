@@ -0,0 +1,150 @@
+"""
+Cross-region anomaly detection per product.
+
+For each product column of the region x product matrix the cross-region
+mean/stddev (or median/MAD) is computed and every present cell gets a
+z-score. Regions that do not sell a product are left out of its statistics.
+
+Moments are held in RunningMoments, which merge exactly (Chan et al.), so
+StreamingAnomalyDetector can fold in sales_data in chunks of regions and
+score cells against the combined statistics.
+
+With few regions |z| is bounded by sqrt(n - 1) (1.73 for four regions), so
+the default threshold is lower than the textbook 3.
+"""
+
+import math
+from collections import namedtuple
+from statistics import median
+
+from sales_matrix import SalesMatrix
+
+Anomaly = namedtuple("Anomaly", "region product amount score")
+
+DEFAULT_THRESHOLD = 1.5
+MAD_SCALE = 1.4826
+
+
+class RunningMoments:
+    """Count, mean and sum of squared deviations; mergeable across chunks"""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def of(cls, values):
+        """Moments of a whole chunk of values"""
+        values = list(values)
+        if not values:
+            return cls()
+        mean = math.fsum(values) / len(values)
+        return cls(len(values), mean, math.fsum((value - mean) ** 2 for value in values))
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other):
+        """Combine with another chunk's moments in place"""
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def std(self):
+        """Population standard deviation across regions"""
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def score(self, value):
+        std = self.std
+        return (value - self.mean) / std if std else 0.0
+
+
+def _columns(matrix):
+    """Yield (product, [(region, amount), ...]) for present cells"""
+    for col, product in enumerate(matrix.products):
+        cells = []
+        for row, region in enumerate(matrix.regions):
+            amount = matrix.cell(row, col)
+            if amount is not None:
+                cells.append((region, amount))
+        yield product, cells
+
+
+def _robust_scores(amounts):
+    center = median(amounts)
+    mad = median(abs(amount - center) for amount in amounts) * MAD_SCALE
+    return [(amount - center) / mad if mad else 0.0 for amount in amounts]
+
+
+def detect_anomalies(sales_data, threshold=DEFAULT_THRESHOLD, method="zscore"):
+    """
+    Flag cells far from their product's cross-region centre
+    method: "zscore" (mean/stddev) or "mad" (median/MAD)
+    Return: list of Anomaly, largest |score| first
+    """
+    if sales_data is None:
+        raise TypeError("sales_data cannot be None")
+    if method not in ("zscore", "mad"):
+        raise ValueError(f"method must be 'zscore' or 'mad', got {method!r}")
+    matrix = SalesMatrix.from_sales_data(sales_data)
+    anomalies = []
+    for product, cells in _columns(matrix):
+        amounts = [amount for _, amount in cells]
+        if method == "mad":
+            scores = _robust_scores(amounts)
+        else:
+            moments = RunningMoments.of(amounts)
+            scores = [moments.score(amount) for amount in amounts]
+        for (region, amount), score in zip(cells, scores):
+            if abs(score) >= threshold:
+                anomalies.append(Anomaly(region, product, amount, score))
+    anomalies.sort(key=lambda x: abs(x.score), reverse=True)
+    return anomalies
+
+
+class StreamingAnomalyDetector:
+    """Accumulate per-product moments from chunks of regions"""
+
+    def __init__(self):
+        self.moments = {}
+
+    def update(self, chunk):
+        """Fold a chunk of sales_data (a subset of regions) into the moments"""
+        matrix = SalesMatrix.from_sales_data(chunk)
+        for product, cells in _columns(matrix):
+            self.moments.setdefault(product, RunningMoments()).merge(
+                RunningMoments.of(amount for _, amount in cells))
+        return self
+
+    def score(self, region, product, amount):
+        """Score against the product's moments; products never seen by update() score 0"""
+        moments = self.moments.get(product)
+        if moments is None:
+            return 0.0
+        return moments.score(amount)
+
+    def anomalies(self, chunk, threshold=DEFAULT_THRESHOLD):
+        """Score a chunk's cells against the statistics seen so far"""
+        flagged = []
+        for region, products in chunk.items():
+            for product, amount in products.items():
+                score = self.score(region, product, amount)
+                if abs(score) >= threshold:
+                    flagged.append(Anomaly(region, product, amount, score))
+        flagged.sort(key=lambda x: abs(x.score), reverse=True)
+        return flagged
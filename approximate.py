@@ -0,0 +1,296 @@
+"""
+Sampling-based approximate regional and product analysis.
+
+Cells are sampled without replacement inside each region (one stratum per
+region). Region totals use the stratum expansion estimator with
+finite-population-corrected normal confidence intervals. Every product has
+exactly one cell in each region that sells it, and the product keys are
+already known, so a product total is its sampled amounts plus, for each
+region where its cell has not been drawn yet, that region's sample mean
+(with the region's sample variance). Regions with the same product set
+share one precomputed sum of those means, so an estimate costs one pass
+over the sampled cells plus one step per product rather than one per cell.
+Products that have not been sampled anywhere therefore still appear, with
+an estimate and a non-zero interval.
+
+Label correctness is estimated by drawing the labelled candidate's total and
+averaging the normal probability that every other candidate stays below
+(or above) it. Only candidates whose intervals overlap the labelled one's
+take part, and the draws are capped at about one CDF evaluation per cell
+across all four labels, so estimating never costs more than the exact scan. Refining draws more cells from the same
+per-region permutations, so the answer converges to the exact result once
+every cell is sampled.
+"""
+
+import math
+import random
+from itertools import islice
+from statistics import NormalDist
+
+from aggregation import (BOTTOM_PRODUCT_LABEL, HIGHEST_REGION_LABEL, LOWEST_REGION_LABEL,
+                         TOP_PRODUCT_LABEL, label_products, label_regions, validate_amount)
+
+
+class ApproximateResult:
+    """Estimated results, their intervals and the label probabilities"""
+
+    def __init__(self, regional, products, regional_intervals, product_intervals,
+                 label_probability, sampled_fraction):
+        self.regional = regional
+        self.products = products
+        self.regional_intervals = regional_intervals
+        self.product_intervals = product_intervals
+        self.label_probability = label_probability
+        self.sampled_fraction = sampled_fraction
+
+    @property
+    def exact(self):
+        return self.sampled_fraction >= 1
+
+
+class _Stratum:
+    """Progressive sample of one region's cells"""
+
+    def __init__(self, products):
+        self.products = products
+        self.size = len(products)
+        self.taken = 0
+        self.total = 0
+        self.sum_squares = 0.0
+        self.product_amounts = {}
+        # Sparse Fisher-Yates state: position -> key index swapped into it
+        self._slots = {}
+
+    @property
+    def exhausted(self):
+        return self.taken >= self.size
+
+    def draw(self, count, rng):
+        """Partial Fisher-Yates shuffle over key indices: sample count more cells"""
+        stop = min(self.size, self.taken + count)
+        slots = self._slots
+        picked = []
+        for i in range(self.taken, stop):
+            j = rng.randrange(i, self.size)
+            current = slots.pop(i, i)
+            if j == i:
+                picked.append(current)
+            else:
+                picked.append(slots.get(j, j))
+                slots[j] = current
+        self.taken = stop
+        for product in self._keys_at(sorted(picked)):
+            amount = validate_amount(self.products[product])
+            self.total += amount
+            self.sum_squares += amount * amount
+            self.product_amounts[product] = amount
+
+    def _keys_at(self, indices):
+        """Keys at sorted positions, skipping through the dict without copying it"""
+        keys = iter(self.products)
+        position = 0
+        for index in indices:
+            yield next(islice(keys, index - position, None))
+            position = index + 1
+
+    def cell_moments(self):
+        """Estimated amount of an unsampled cell and its variance"""
+        n = self.taken
+        mean = self.total / n if n else 0
+        if n < 2:
+            return mean, math.inf
+        return mean, max((self.sum_squares - n * mean * mean) / (n - 1), 0.0)
+
+    def region_estimate(self):
+        if self.exhausted:
+            # Exact: sum in dict order so floats match the nested-loop result
+            total = 0
+            for amount in self.products.values():
+                total += amount
+            return total, 0.0
+        n, size = self.taken, self.size
+        mean, variance = self.cell_moments()
+        return size * mean, size * size * (1 - n / size) * variance / n if n else math.inf
+
+
+class ApproximateAnalysis:
+    """
+    Progressive approximate analysis over sales_data
+
+    Start with a sampled fraction and call refine() to tighten the intervals.
+    """
+
+    def __init__(self, sales_data, fraction=0.01, min_per_region=2, confidence=0.95,
+                 draws=1000, seed=None):
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        self._rng = random.Random(seed)
+        self.confidence = confidence
+        self.draws = draws
+        self.min_per_region = min_per_region
+        self.strata = {region: _Stratum(products) for region, products in sales_data.items()}
+        self.cells = sum(stratum.size for stratum in self.strata.values())
+        self.products = {}
+        groups = {}
+        for stratum in self.strata.values():
+            self.products.update(dict.fromkeys(stratum.products))
+            groups.setdefault(frozenset(stratum.products), []).append(stratum)
+        # Regions grouped by product set: (products, strata)
+        self._groups = list(groups.items())
+        self.refine(fraction)
+
+    @property
+    def sampled(self):
+        return sum(stratum.taken for stratum in self.strata.values())
+
+    def refine(self, fraction):
+        """Grow every stratum's sample to at least fraction of its cells"""
+        for stratum in self.strata.values():
+            target = max(self.min_per_region, math.ceil(stratum.size * fraction))
+            stratum.draw(target - stratum.taken, self._rng)
+        return self.estimate()
+
+    def progressive(self, factor=2.0):
+        """Yield results with the sampled fraction growing by factor until exact"""
+        fraction = self.sampled / self.cells if self.cells else 1
+        result = self.estimate()
+        yield result
+        while not result.exact:
+            fraction = min(1.0, max(fraction * factor, fraction + 1 / max(self.cells, 1)))
+            result = self.refine(fraction)
+            yield result
+
+    def estimate(self):
+        """Current estimates with intervals and label probabilities"""
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+        region_moments = {region: stratum.region_estimate() for region, stratum in self.strata.items()}
+        product_moments = self._product_moments()
+
+        regional = label_regions({region: total for region, (total, _) in region_moments.items()})
+        products = label_products({product: total for product, (total, _) in product_moments.items()})
+
+        regional_intervals = self._intervals(region_moments, z)
+        product_intervals = self._intervals(product_moments, z)
+
+        probability = {}
+        for label, results, moments, intervals, pick in (
+                (HIGHEST_REGION_LABEL, regional, region_moments, regional_intervals, max),
+                (LOWEST_REGION_LABEL, regional, region_moments, regional_intervals, min),
+                (TOP_PRODUCT_LABEL, products, product_moments, product_intervals, max),
+                (BOTTOM_PRODUCT_LABEL, products, product_moments, product_intervals, min)):
+            chosen = next((name for name, (_, assigned) in results.items() if assigned == label), None)
+            if chosen is not None:
+                probability[label] = self._label_probability(moments, intervals, chosen, pick)
+
+        sampled_fraction = self.sampled / self.cells if self.cells else 1
+        return ApproximateResult(regional, products, regional_intervals, product_intervals,
+                                 probability, sampled_fraction)
+
+    def _product_moments(self):
+        """Estimated total and variance of every product"""
+        # Per product set: regions still being sampled, sum of their cell
+        # means, sum of their finite variances, count of infinite ones
+        baselines = []
+        for products, strata in self._groups:
+            open_count, means, variances, unbounded = 0, 0, 0.0, 0
+            for stratum in strata:
+                if stratum.exhausted:
+                    continue
+                mean, variance = stratum.cell_moments()
+                open_count += 1
+                means += mean
+                if math.isinf(variance):
+                    unbounded += 1
+                else:
+                    variances += variance
+            baselines.append((products, (open_count, means, variances, unbounded)))
+
+        # Sampled cells: amounts, plus the baseline terms they replace
+        sampled = {}
+        for stratum in self.strata.values():
+            partial = not stratum.exhausted
+            if partial:
+                mean, variance = stratum.cell_moments()
+                unbounded = math.isinf(variance)
+            for product, amount in stratum.product_amounts.items():
+                entry = sampled.get(product)
+                if entry is None:
+                    entry = sampled[product] = [0, 0, 0, 0.0, 0]
+                entry[0] += amount
+                if partial:
+                    entry[1] += 1
+                    entry[2] += mean
+                    if unbounded:
+                        entry[4] += 1
+                    else:
+                        entry[3] += variance
+
+        single = baselines[0][1] if len(baselines) == 1 else None
+        nothing = (0, 0, 0, 0.0, 0)
+        moments = {}
+        for product in self.products:
+            if single is not None:
+                open_count, means, variances, unbounded = single
+            else:
+                open_count, means, variances, unbounded = 0, 0, 0.0, 0
+                for products, baseline in baselines:
+                    if product in products:
+                        open_count += baseline[0]
+                        means += baseline[1]
+                        variances += baseline[2]
+                        unbounded += baseline[3]
+            amounts, closed, removed_means, removed_variances, removed_unbounded = sampled.get(product, nothing)
+            if open_count == closed:
+                moments[product] = (amounts, 0.0)
+            elif unbounded > removed_unbounded:
+                moments[product] = (amounts + (means - removed_means), math.inf)
+            else:
+                moments[product] = (amounts + (means - removed_means), max(variances - removed_variances, 0.0))
+        return moments
+
+    @staticmethod
+    def _intervals(moments, z):
+        intervals = {}
+        for name, (total, variance) in moments.items():
+            margin = z * math.sqrt(variance)
+            intervals[name] = (max(0, total - margin), total + margin)
+        return intervals
+
+    def _label_probability(self, moments, intervals, chosen, pick):
+        """
+        Probability that chosen stays the extreme: the mean over draws of
+        chosen's value of the chance that every other candidate stays on the
+        near side of it
+        """
+        low, high = intervals[chosen]
+        if pick is max:
+            names = [name for name, (_, upper) in intervals.items() if upper >= low]
+        else:
+            names = [name for name, (lower, _) in intervals.items() if lower <= high]
+        if len(names) == 1:
+            return 1.0
+        # Flip minimums to maximums so the same comparison serves both
+        sign = 1 if pick is max else -1
+        others = [(sign * moments[name][0], math.sqrt(moments[name][1])) for name in names if name != chosen]
+        unbounded = sum(math.isinf(sigma) for _, sigma in others)
+        if math.isinf(moments[chosen][1]):
+            return 1 / (unbounded + 1)
+        others = [(mean, sigma) for mean, sigma in others if not math.isinf(sigma)]
+
+        def stays_below(value):
+            chance = 0.5 ** unbounded
+            for mean, sigma in others:
+                if sigma:
+                    chance *= 0.5 * math.erfc((mean - value) / (sigma * math.sqrt(2)))
+                elif mean > value:
+                    return 0.0
+            return chance
+
+        center, sigma = sign * moments[chosen][0], math.sqrt(moments[chosen][1])
+        if sigma == 0:
+            return stays_below(center)
+        # Budget: about one CDF evaluation per cell across the four labels
+        draws = min(self.draws, max(1, self.cells // (4 * len(names))))
+        gauss = self._rng.gauss
+        return sum(stays_below(center + sigma * gauss(0, 1)) for _ in range(draws)) / draws
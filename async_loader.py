@@ -0,0 +1,166 @@
+"""
+Concurrent loading of per-region sources with asyncio.
+
+Each region has its own source: a local file path or an http:// or https://
+URL (for example a local object-store emulator). Every source holds that
+region's "product,amount" CSV lines, optionally under a "product,amount"
+header; an unquoted product name may itself contain commas, since the last
+field is always the amount. A source whose first line is the
+"region,product,amount" export header is read as an export instead, and
+every row in it must belong to that region. Any other URL scheme is
+rejected before anything is fetched. All
+sources are fetched concurrently under a bounded semaphore, and each one is
+parsed and folded into running SalesTotals as soon as it arrives, so
+aggregation overlaps with the remaining I/O. The caller gets the complete
+sales_data and totals at the end, ready for the synchronous analyses.
+"""
+
+import asyncio
+import csv
+from urllib.parse import urlsplit
+
+from aggregation import SalesTotals
+from sales_file import HEADER, parse_amount, parse_sales_lines
+
+SCHEMES = ("http", "https")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _read_file(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+async def _read_chunked(reader, timeout):
+    """Decode a Transfer-Encoding: chunked body"""
+    parts = []
+    while True:
+        size_line = await asyncio.wait_for(reader.readline(), timeout)
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            break
+        parts.append(await asyncio.wait_for(reader.readexactly(size), timeout))
+        await asyncio.wait_for(reader.readexactly(2), timeout)
+    while await asyncio.wait_for(reader.readline(), timeout) not in (b"\r\n", b"\n", b""):
+        pass
+    return b"".join(parts)
+
+
+async def _fetch_http(url, timeout):
+    """
+    Minimal HTTP/1.0 GET over asyncio streams, with TLS for https://
+    HTTP/1.0 keeps servers from chunking the reply, but a chunked body is
+    still decoded in case a server sends one anyway
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in SCHEMES:
+        raise ValueError(f"Unsupported source scheme: {url!r}")
+    port = parts.port or DEFAULT_PORTS[parts.scheme]
+    tls = True if parts.scheme == "https" else None
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(parts.hostname, port, ssl=tls), timeout)
+    try:
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        writer.write(f"GET {path} HTTP/1.0\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n".encode("ascii"))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        status = int(status_line.split()[1])
+        length = None
+        chunked = False
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                codings = [coding.strip() for coding in value.split(",")]
+                if codings != ["chunked"]:
+                    raise OSError(f"GET {url} used unsupported Transfer-Encoding: {value}")
+                chunked = True
+        if chunked:
+            body = await _read_chunked(reader, timeout)
+        elif length is not None:
+            body = await asyncio.wait_for(reader.readexactly(length), timeout)
+        else:
+            body = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    if status != 200:
+        raise OSError(f"GET {url} returned HTTP {status}")
+    return body.decode("utf-8")
+
+
+def _is_url(source):
+    return "://" in source
+
+
+def parse_region_source(region, text):
+    """Yield (product, amount) from a region source"""
+    lines = text.splitlines()
+    first = next((line for line in lines if line.strip()), "")
+    header = [field.strip().lower() for field in next(csv.reader([first]), [])]
+    if header == HEADER:
+        for row_region, product, amount in parse_sales_lines(lines):
+            if row_region != region:
+                raise ValueError(f"Row for region {row_region!r} in {region!r} source")
+            yield product, amount
+        return
+    if header == ["product", "amount"]:
+        lines = lines[lines.index(first) + 1:]
+    for row in csv.reader(lines):
+        if not row or not any(field.strip() for field in row):
+            continue
+        product = ",".join(row[:-1]).strip()
+        if not product:
+            raise ValueError(f"Expected product,amount in {region!r} source but got {row}")
+        yield product, parse_amount(row[-1])
+
+
+async def load_regions(sources, concurrency=8, timeout=30.0, on_region=None):
+    """
+    Fetch {region: path or URL} concurrently and fold each into running totals
+    on_region(region, totals) is called after each region is folded in
+    Return: SalesTotals for all regions
+    """
+    if sources is None:
+        raise TypeError("sources cannot be None")
+    for source in sources.values():
+        if _is_url(source) and urlsplit(source).scheme not in SCHEMES:
+            raise ValueError(f"Unsupported source scheme: {source!r}")
+    semaphore = asyncio.Semaphore(concurrency)
+    totals = SalesTotals()
+    for region in sources:
+        totals.cells.setdefault(region, {})
+        totals.region_totals.setdefault(region, 0)
+
+    async def fetch(region, source):
+        async with semaphore:
+            if _is_url(source):
+                text = await _fetch_http(source, timeout)
+            else:
+                text = await asyncio.to_thread(_read_file, source)
+        return region, text
+
+    pending = [asyncio.ensure_future(fetch(region, source)) for region, source in sources.items()]
+    try:
+        for finished in asyncio.as_completed(pending):
+            region, text = await finished
+            for product, amount in parse_region_source(region, text):
+                totals.set_amount(region, product, amount)
+            if on_region is not None:
+                on_region(region, totals)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        raise
+    return totals
+
+
+def load_sales_data_async(sources, concurrency=8, timeout=30.0):
+    """Synchronous entry point: return the complete nested sales_data"""
+    return asyncio.run(load_regions(sources, concurrency, timeout)).to_sales_data()
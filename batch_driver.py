@@ -0,0 +1,141 @@
+"""
+Bulk analysis driver for many store-day export files.
+
+Files are spread over a warm ProcessPoolExecutor in chunks (executor.map
+chunksize); each worker reads one export, totals it and returns only the
+small per-file totals, which are merged into global regional and product
+rollups. A file that cannot be read or fails validation is recorded as a
+failure and the run continues with the remaining files. The report includes
+throughput, the failed files and the straggler files whose processing time
+stands out from the rest.
+
+Usage: python batch_driver.py <export.csv> [<export.csv> ...]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregation import SalesTotals, label_products, label_regions
+from sales_file import read_sales_file
+
+
+def analyze_file(path):
+    """
+    Worker: return (path, region totals, product totals, seconds, cells, error)
+    error is None on success, otherwise a message and the totals are None
+    """
+    started = time.perf_counter()
+    try:
+        totals = SalesTotals(read_sales_file(path))
+    except Exception as e:
+        return path, None, None, time.perf_counter() - started, 0, f"{type(e).__name__}: {e}"
+    cells = sum(len(products) for products in totals.cells.values())
+    return path, totals.region_totals, totals.product_totals, time.perf_counter() - started, cells, None
+
+
+class BatchReport:
+    """Merged rollups plus run statistics"""
+
+    def __init__(self, region_totals, product_totals, timings, cells, elapsed, failures=None):
+        self.regional = label_regions(region_totals)
+        self.products = label_products(product_totals)
+        self.timings = timings
+        self.failures = failures or {}
+        self.files = len(timings)
+        self.cells = cells
+        self.elapsed = elapsed
+
+    @property
+    def files_per_second(self):
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def cells_per_second(self):
+        return self.cells / self.elapsed if self.elapsed else 0.0
+
+    def stragglers(self, factor=3.0):
+        """Files that took more than factor x the median time, slowest first"""
+        if not self.timings:
+            return []
+        threshold = statistics.median(self.timings.values()) * factor
+        slow = [(seconds, path) for path, seconds in self.timings.items() if seconds > threshold]
+        return [(path, seconds) for seconds, path in sorted(slow, reverse=True)]
+
+
+class BatchDriver:
+    """Keeps one warm process pool across batch runs"""
+
+    def __init__(self, workers=None, chunk_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def run(self, paths):
+        """Analyze every file and merge the results into global rollups"""
+        paths = list(paths)
+        chunk_size = self.chunk_size or max(1, len(paths) // (self.workers * 4))
+        started = time.perf_counter()
+        region_totals = {}
+        product_totals = {}
+        timings = {}
+        failures = {}
+        cells = 0
+        for path, regions, products, seconds, file_cells, error in self._pool().map(analyze_file, paths,
+                                                                                      chunksize=chunk_size):
+            if error is not None:
+                failures[path] = error
+                continue
+            for region, total in regions.items():
+                region_totals[region] = region_totals.get(region, 0) + total
+            for product, total in products.items():
+                product_totals[product] = product_totals.get(product, 0) + total
+            timings[path] = seconds
+            cells += file_cells
+        return BatchReport(region_totals, product_totals, timings, cells, time.perf_counter() - started, failures)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv=None):
+    """Run the batch driver over the files given on the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python batch_driver.py <export.csv> [<export.csv> ...]")
+        return 1
+    try:
+        from skeleton import display_results
+        with BatchDriver() as driver:
+            report = driver.run(argv)
+        display_results(report.regional, "Regional Sales Analysis")
+        display_results(report.products, "Product Performance Analysis")
+        print(f"Files: {report.files}  Cells: {report.cells}  Time: {report.elapsed:.2f}s")
+        print(f"Throughput: {report.files_per_second:,.1f} files/s, {report.cells_per_second:,.0f} cells/s")
+        for path, seconds in report.stragglers():
+            print(f"Straggler: {path} ({seconds * 1000:.1f} ms)")
+        for path, error in report.failures.items():
+            print(f"Failed: {path} ({error})")
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
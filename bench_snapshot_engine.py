@@ -0,0 +1,96 @@
+"""
+Throughput benchmark: snapshot engine vs a global lock with mixed threads.
+
+Usage: python bench_snapshot_engine.py [readers] [seconds] [regions] [products]
+"""
+
+import random
+import sys
+import threading
+import time
+
+from aggregation import SalesTotals
+from snapshot_engine import SnapshotEngine
+
+
+def make_sales_data(regions, products):
+    """Generate a dense region x product dataset"""
+    rng = random.Random(42)
+    return {
+        f"Region{r}": {f"Product{p}": rng.randint(0, 1000) for p in range(products)}
+        for r in range(regions)
+    }
+
+
+class GlobalLockEngine:
+    """Baseline: every read and write holds one lock"""
+
+    def __init__(self, sales_data):
+        self._lock = threading.Lock()
+        self._totals = SalesTotals(sales_data)
+
+    def set_amount(self, region, product, amount):
+        with self._lock:
+            self._totals.set_amount(region, product, amount)
+
+    def analyze_regional_sales(self):
+        with self._lock:
+            return self._totals.regional_results()
+
+    def analyze_product_performance(self):
+        with self._lock:
+            return self._totals.product_results()
+
+
+def run(engine, readers, seconds, regions, products):
+    """Return (reads, writes) completed within the time budget"""
+    stop = threading.Event()
+    reads = [0] * readers
+    writes = [0]
+
+    def reader(index):
+        count = 0
+        while not stop.is_set():
+            engine.analyze_regional_sales()
+            engine.analyze_product_performance()
+            count += 1
+        reads[index] = count
+
+    def writer():
+        rng = random.Random(7)
+        count = 0
+        while not stop.is_set():
+            engine.set_amount(f"Region{rng.randrange(regions)}",
+                              f"Product{rng.randrange(products)}", rng.randint(0, 1000))
+            count += 1
+        writes[0] = count
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(reads), writes[0]
+
+
+def main():
+    """Run both engines and print reads/writes per second"""
+    args = [int(arg) for arg in sys.argv[1:]]
+    readers, seconds, regions, products = (args + [8, 3, 50, 200][len(args):])[:4]
+    sales_data = make_sales_data(regions, products)
+
+    print("=" * 60)
+    print(f"{'Engine':<20}{'Reads/s':>20}{'Writes/s':>20}")
+    print("-" * 60)
+    for name, engine in (("global lock", GlobalLockEngine(sales_data)),
+                         ("snapshot", SnapshotEngine(sales_data))):
+        reads, writes = run(engine, readers, seconds, regions, products)
+        print(f"{name:<20}{reads / seconds:>20,.0f}{writes / seconds:>20,.0f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
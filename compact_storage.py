@@ -0,0 +1,244 @@
+"""
+Compact in-memory storage for sales_data.
+
+Each region is stored as one block: a dense array over the product table
+using the narrowest safe typecode for its values:
+
+    'h' int16 -> 'i' int32 -> 'q' int64        (whole-number blocks)
+    'f' float32 -> 'd' float64                 (blocks holding fractions)
+
+float32 is only chosen when every value round-trips exactly. Updates that
+do not fit the current typecode upcast the block. Bitmaps record missing
+cells (only for blocks with gaps) and which cells were floats (only for
+float blocks), so totals keep the int/float types of the nested-loop
+analyses. Whole-number blocks are summed into Python ints and float blocks
+with math.fsum, so the accumulators never lose precision.
+"""
+
+import math
+import struct
+from array import array
+
+from aggregation import label_products, label_regions, validate_amount
+
+INT_CODES = (("h", 2 ** 15 - 1), ("i", 2 ** 31 - 1), ("q", 2 ** 63 - 1))
+INT_ORDER = "hiq"
+FLOAT_CODES = ("f", "d")
+MAX_EXACT_FLOAT_INT = 2 ** 53
+_FLOAT32 = struct.Struct("f")
+
+
+def _fits_float32(value):
+    try:
+        return _FLOAT32.unpack(_FLOAT32.pack(value))[0] == value
+    except OverflowError:
+        return False
+
+
+def narrowest_typecode(values, has_float):
+    """Smallest typecode that stores every value exactly"""
+    if not has_float:
+        largest = max((abs(value) for value in values), default=0)
+        for code, limit in INT_CODES:
+            if largest <= limit:
+                return code
+        return "d"
+    return "f" if all(_fits_float32(value) for value in values) else "d"
+
+
+def _get_bit(bitmap, index):
+    return bitmap is not None and index // 8 < len(bitmap) and bitmap[index // 8] >> (index % 8) & 1
+
+
+def _set_bit(bitmap, index, on):
+    while index // 8 >= len(bitmap):
+        bitmap.append(0)
+    if on:
+        bitmap[index // 8] |= 1 << (index % 8)
+    else:
+        bitmap[index // 8] &= ~(1 << (index % 8))
+
+
+class CompactBlock:
+    """One region's amounts in the narrowest safe array"""
+
+    __slots__ = ("values", "missing", "floats")
+
+    def __init__(self, values, missing=None, floats=None):
+        self.values = values
+        self.missing = missing
+        self.floats = floats
+
+    @property
+    def typecode(self):
+        return self.values.typecode
+
+    @property
+    def nbytes(self):
+        size = self.values.itemsize * len(self.values)
+        return size + len(self.missing or b"") + len(self.floats or b"")
+
+    def is_present(self, col):
+        return col < len(self.values) and not _get_bit(self.missing, col)
+
+    def is_float(self, col):
+        return _get_bit(self.floats, col)
+
+    def get(self, col):
+        if not self.is_present(col):
+            return None
+        value = self.values[col]
+        if self.typecode in FLOAT_CODES and not self.is_float(col):
+            return int(value)
+        return value
+
+    def _upcast(self, amount):
+        code = self.typecode
+        if code in FLOAT_CODES:
+            if isinstance(amount, int) and abs(amount) > MAX_EXACT_FLOAT_INT:
+                raise OverflowError(f"Sales amount {amount} cannot be stored exactly alongside floats")
+            new_code = "f" if code == "f" and _fits_float32(amount) else "d"
+        elif isinstance(amount, float):
+            if any(abs(value) > MAX_EXACT_FLOAT_INT for value in self.values):
+                raise OverflowError("Block holds integers too large to store exactly alongside floats")
+            new_code = narrowest_typecode(list(self.values) + [amount], True)
+            self.floats = bytearray()
+        else:
+            needed = narrowest_typecode([amount], False)
+            if needed == "d":
+                raise OverflowError(f"Sales amount {amount} does not fit in int64")
+            new_code = max(code, needed, key=INT_ORDER.index)
+        if new_code != code:
+            self.values = array(new_code, self.values)
+
+    def set(self, col, amount):
+        """Store an amount, widening the block if it does not fit"""
+        self._upcast(amount)
+        if col >= len(self.values):
+            if self.missing is None:
+                self.missing = bytearray()
+            for gap in range(len(self.values), col):
+                _set_bit(self.missing, gap, True)
+            self.values.extend([0] * (col + 1 - len(self.values)))
+        self.values[col] = amount
+        if self.missing is not None:
+            _set_bit(self.missing, col, False)
+        if self.floats is not None:
+            _set_bit(self.floats, col, isinstance(amount, float))
+
+    def total(self):
+        """Exact block total with the nested-loop result type"""
+        if self.typecode not in FLOAT_CODES:
+            return sum(self.values)
+        if not any(self.floats or b""):
+            return sum(int(value) for value in self.values)
+        return math.fsum(self.values)
+
+
+class CompactSalesData:
+    """sales_data held as one compact block per region"""
+
+    def __init__(self, sales_data=None):
+        self.products = {}
+        self.blocks = {}
+        if sales_data is not None:
+            self.load(sales_data)
+
+    def load(self, sales_data):
+        """Inspect each region's values and store them at the narrowest width"""
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        for products in sales_data.values():
+            for product in products:
+                self.products.setdefault(product, len(self.products))
+        width = len(self.products)
+        for region, products in sales_data.items():
+            has_float = False
+            largest_int = 0
+            for amount in products.values():
+                validate_amount(amount)
+                if isinstance(amount, float):
+                    has_float = True
+                else:
+                    largest_int = max(largest_int, amount)
+            if has_float and largest_int > MAX_EXACT_FLOAT_INT:
+                raise OverflowError(f"Sales amounts in {region!r} include integers too large "
+                                    "to store exactly alongside floats")
+            code = narrowest_typecode(products.values(), has_float)
+            if code == "d" and not has_float:
+                raise OverflowError(f"Sales amounts in {region!r} do not fit in int64")
+            values = array(code, bytes(array(code).itemsize * width))
+            missing = None
+            floats = bytearray((width + 7) // 8) if code in FLOAT_CODES else None
+            present = set()
+            for product, amount in products.items():
+                col = self.products[product]
+                values[col] = amount
+                present.add(col)
+                if floats is not None and isinstance(amount, float):
+                    _set_bit(floats, col, True)
+            if len(present) < width:
+                missing = bytearray((width + 7) // 8)
+                for col in range(width):
+                    if col not in present:
+                        _set_bit(missing, col, True)
+            self.blocks[region] = CompactBlock(values, missing, floats)
+
+    def set_amount(self, region, product, amount):
+        """Update one cell, upcasting its block on overflow"""
+        validate_amount(amount)
+        col = self.products.setdefault(product, len(self.products))
+        block = self.blocks.get(region)
+        if block is None:
+            block = self.blocks[region] = CompactBlock(array("h"))
+        block.set(col, amount)
+
+    def get(self, region, product):
+        col = self.products.get(product)
+        if col is None or region not in self.blocks:
+            return None
+        return self.blocks[region].get(col)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the value arrays and bitmaps"""
+        return sum(block.nbytes for block in self.blocks.values())
+
+    def typecodes(self):
+        return {region: block.typecode for region, block in self.blocks.items()}
+
+    def region_totals(self):
+        return {region: block.total() for region, block in self.blocks.items()}
+
+    def product_totals(self):
+        """Per-product totals: ints summed exactly, floats with fsum"""
+        int_sums = [0] * len(self.products)
+        float_parts = [None] * len(self.products)
+        seen = [False] * len(self.products)
+        for block in self.blocks.values():
+            is_float_block = block.typecode in FLOAT_CODES
+            values = block.values
+            for col in range(len(values)):
+                if not block.is_present(col):
+                    continue
+                seen[col] = True
+                if is_float_block and block.is_float(col):
+                    if float_parts[col] is None:
+                        float_parts[col] = []
+                    float_parts[col].append(values[col])
+                else:
+                    int_sums[col] += int(values[col])
+        totals = {}
+        for product, col in self.products.items():
+            if seen[col]:
+                parts = float_parts[col]
+                totals[product] = int_sums[col] if parts is None else math.fsum(parts + [int_sums[col]])
+        return totals
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales"""
+        return label_regions(self.region_totals())
+
+    def product_results(self):
+        """Same shape as analyze_product_performance"""
+        return label_products(self.product_totals())
@@ -0,0 +1,92 @@
+"""
+Product correlation across regions.
+
+Each product column of the region x product matrix (missing cells count as
+zero sales) is centred and scaled to unit length, after which the Pearson
+correlation of two products is the dot product of their unit columns.
+
+Column means and norms come from two streaming passes over the matrix rows.
+Products are then processed in blocks: a block's unit columns are built
+from row-major slices of the matrix (transposed at C level with zip), and
+each pair of blocks yields its block x block Gram matrix of dot products,
+keeping only pairs at or above the threshold. At most two blocks of unit
+columns exist at a time, so memory beyond the matrix is O(block_size * R)
+rather than O(P * R), and the dense P x P matrix is never built.
+"""
+
+import math
+from operator import add, mul, sub
+
+from sales_matrix import SalesMatrix
+
+DEFAULT_BLOCK_SIZE = 256
+
+
+def _rows(matrix):
+    width = len(matrix.products)
+    values = matrix.values
+    for row in range(len(matrix.regions)):
+        yield values[row * width:(row + 1) * width]
+
+
+def _column_scales(matrix):
+    """Per-column means and reciprocal centred norms (0 for constant columns)"""
+    width = len(matrix.products)
+    count = len(matrix.regions)
+    sums = [0.0] * width
+    for row in _rows(matrix):
+        sums = list(map(add, sums, row))
+    means = [total / count for total in sums] if count else sums
+    squares = [0.0] * width
+    for row in _rows(matrix):
+        centred = list(map(sub, row, means))
+        squares = list(map(add, squares, map(mul, centred, centred)))
+    return means, [1 / math.sqrt(square) if square else 0.0 for square in squares]
+
+
+def _unit_block(matrix, start, stop, means, scales):
+    """[(column index, unit column)] for columns start..stop, skipping constant ones"""
+    width = len(matrix.products)
+    values = matrix.values
+    block_means, block_scales = means[start:stop], scales[start:stop]
+    rows = [list(map(mul, map(sub, values[base + start:base + stop], block_means), block_scales))
+            for base in range(0, len(matrix.regions) * width, width)]
+    return [(start + i, column) for i, column in enumerate(zip(*rows)) if block_scales[i]]
+
+
+def iter_correlated_pairs(sales_data, threshold=0.8, absolute=True, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Yield (product, other product, r) for every pair with r >= threshold
+    (|r| >= threshold when absolute), block by block
+    """
+    if sales_data is None:
+        raise TypeError("sales_data cannot be None")
+    if block_size < 1:
+        raise ValueError("block_size must be at least 1")
+    matrix = SalesMatrix.from_sales_data(sales_data)
+    products = matrix.products
+    width = len(products)
+    means, scales = _column_scales(matrix)
+    for start in range(0, width, block_size):
+        block = _unit_block(matrix, start, min(start + block_size, width), means, scales)
+        for other_start in range(start, width, block_size):
+            if other_start == start:
+                others = block
+            else:
+                others = _unit_block(matrix, other_start, min(other_start + block_size, width), means, scales)
+            for i, (col, vector) in enumerate(block):
+                for other_col, other_vector in (others[i + 1:] if other_start == start else others):
+                    r = sum(map(mul, vector, other_vector))
+                    r = max(-1.0, min(1.0, r))
+                    if (abs(r) if absolute else r) >= threshold:
+                        yield products[col], products[other_col], r
+
+
+def correlated_products(sales_data, threshold=0.8, absolute=True, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Product pairs whose sales move together across regions
+    Return: list of (product, other product, r), strongest first
+    """
+    pairs = list(iter_correlated_pairs(sales_data, threshold, absolute, block_size))
+    pairs.sort(key=lambda x: abs(x[2]), reverse=True)
+    return pairs
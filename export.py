@@ -0,0 +1,83 @@
+"""
+Streaming exporters for analysis results.
+
+Results can be the dicts returned by the analyses or any iterable of
+(name, (total, label)) pairs, e.g. a generator, so multi-million-row product
+outputs are written in constant memory through a large write buffer.
+"""
+
+import csv
+import json
+from itertools import islice
+
+REGIONAL_ANALYSIS = "Regional Sales Analysis"
+PRODUCT_ANALYSIS = "Product Performance Analysis"
+
+COLUMNS = {
+    REGIONAL_ANALYSIS: ("Region", "Total Sales", "Performance"),
+    PRODUCT_ANALYSIS: ("Product", "Total Units", "Ranking"),
+}
+
+BUFFER_SIZE = 1 << 20
+BATCH_ROWS = 4096
+
+
+def _columns(analysis_type):
+    try:
+        return COLUMNS[analysis_type]
+    except KeyError:
+        raise ValueError(f"Unknown analysis type: {analysis_type!r}")
+
+
+def iter_result_rows(results):
+    """Yield (name, total, label) rows from a result dict or pair iterable"""
+    if results is None:
+        raise TypeError("results cannot be None")
+    items = results.items() if hasattr(results, "items") else results
+    for name, (total, label) in items:
+        yield name, total, label
+
+
+def _write_batches(file, lines):
+    """Hand lines to the buffered file in fixed-size batches"""
+    count = 0
+    while True:
+        batch = list(islice(lines, BATCH_ROWS))
+        if not batch:
+            return count
+        file.writelines(batch)
+        count += len(batch)
+
+
+def export_csv(results, path, analysis_type):
+    """
+    Stream results to a CSV file with the display_results column headers
+    Return: number of data rows written
+    """
+    columns = _columns(analysis_type)
+    with open(path, "w", newline="", buffering=BUFFER_SIZE) as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        count = 0
+        rows = iter_result_rows(results)
+        while True:
+            batch = list(islice(rows, BATCH_ROWS))
+            if not batch:
+                return count
+            writer.writerows(batch)
+            count += len(batch)
+
+
+def export_jsonl(results, path, analysis_type):
+    """
+    Stream results to a JSON Lines file, one object per row
+    Return: number of rows written
+    """
+    key, total_key, label_key = (column.lower().replace(" ", "_") for column in _columns(analysis_type))
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+    lines = (
+        dumps({key: name, total_key: total, label_key: label}) + "\n"
+        for name, total, label in iter_result_rows(results)
+    )
+    with open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE) as file:
+        return _write_batches(file, lines)
@@ -0,0 +1,143 @@
+"""
+Exact fixed-point aggregation in integer cents.
+
+Every amount is converted once to int64 cents and laid out in a flat
+region x product array('q'); region totals are sums of contiguous row slices
+and product totals sums of strided column slices, both done by the C-level
+sum() over the array. Integer sums are associative, so totals are identical
+however the rows are sharded and merged. Totals are converted back at the
+end: int where every contributing amount was an int, otherwise a float
+correctly rounded from the exact cent total.
+"""
+
+import math
+from array import array
+
+from aggregation import label_products, label_regions, validate_amount
+
+INT64_MAX = 2 ** 63 - 1
+# Float amounts may sit this many ulps away from a whole number of cents
+CENT_TOLERANCE_ULPS = 2
+
+
+def to_cents(amount):
+    """
+    Convert a validated amount to integer cents, rejecting sub-cent values
+    Floats within rounding error of a cent (such as 0.1 + 0.2) are accepted
+    """
+    validate_amount(amount)
+    if isinstance(amount, int):
+        cents = amount * 100
+    else:
+        cents = round(amount * 100)
+        scaled = amount * 100
+        if abs(scaled - cents) > CENT_TOLERANCE_ULPS * math.ulp(scaled):
+            raise ValueError(f"Sales amount {amount!r} is not a whole number of cents")
+    if cents > INT64_MAX:
+        raise OverflowError(f"Sales amount {amount!r} does not fit in int64 cents")
+    return cents
+
+
+def from_cents(cents, is_float):
+    """Convert a cent total back to the analysis output type"""
+    if cents > INT64_MAX:
+        raise OverflowError(f"Total of {cents} cents overflows int64")
+    if is_float:
+        return cents / 100
+    return cents // 100
+
+
+class CentsAggregate:
+    """Regional and product totals in cents for one shard of sales_data"""
+
+    def __init__(self):
+        self.region_cents = {}
+        self.region_float = {}
+        self.product_cents = {}
+        self.product_float = {}
+
+    @classmethod
+    def from_sales_data(cls, sales_data):
+        """Convert sales_data once and total it with array slices"""
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        column = {}
+        for products in sales_data.values():
+            for product in products:
+                column.setdefault(product, len(column))
+        width = len(column)
+        regions = list(sales_data)
+        cents = array("q", bytes(8 * len(regions) * width))
+        column_float = [False] * width
+        column_seen = [False] * width
+
+        aggregate = cls()
+        for row, (region, products) in enumerate(sales_data.items()):
+            base = row * width
+            has_float = False
+            for product, amount in products.items():
+                col = column[product]
+                cents[base + col] = to_cents(amount)
+                column_seen[col] = True
+                if isinstance(amount, float):
+                    has_float = column_float[col] = True
+            aggregate.region_cents[region] = sum(cents[base:base + width])
+            aggregate.region_float[region] = has_float
+
+        for product, col in column.items():
+            if column_seen[col]:
+                aggregate.product_cents[product] = sum(cents[col::width]) if width else 0
+                aggregate.product_float[product] = column_float[col]
+        aggregate._check()
+        return aggregate
+
+    def _check(self):
+        for totals in (self.region_cents, self.product_cents):
+            for name, cents in totals.items():
+                if cents > INT64_MAX:
+                    raise OverflowError(f"Total for {name!r} overflows int64 cents")
+
+    def merge(self, other):
+        """Fold another shard into this one; order of merging does not matter"""
+        for region, cents in other.region_cents.items():
+            self.region_cents[region] = self.region_cents.get(region, 0) + cents
+            self.region_float[region] = self.region_float.get(region, False) or other.region_float[region]
+        for product, cents in other.product_cents.items():
+            self.product_cents[product] = self.product_cents.get(product, 0) + cents
+            self.product_float[product] = self.product_float.get(product, False) or other.product_float[product]
+        self._check()
+        return self
+
+    def region_totals(self):
+        return {region: from_cents(cents, self.region_float[region])
+                for region, cents in self.region_cents.items()}
+
+    def product_totals(self):
+        return {product: from_cents(cents, self.product_float[product])
+                for product, cents in self.product_cents.items()}
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales"""
+        return label_regions(self.region_totals())
+
+    def product_results(self):
+        """Same shape as analyze_product_performance"""
+        return label_products(self.product_totals())
+
+
+def aggregate_sharded(shards):
+    """Merge CentsAggregates built from any split of sales_data"""
+    total = CentsAggregate()
+    for shard in shards:
+        total.merge(shard if isinstance(shard, CentsAggregate) else CentsAggregate.from_sales_data(shard))
+    return total
+
+
+def analyze_regional_sales_exact(sales_data):
+    """analyze_regional_sales computed in integer cents"""
+    return CentsAggregate.from_sales_data(sales_data).regional_results()
+
+
+def analyze_product_performance_exact(sales_data):
+    """analyze_product_performance computed in integer cents"""
+    return CentsAggregate.from_sales_data(sales_data).product_results()
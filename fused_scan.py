@@ -0,0 +1,167 @@
+"""
+Fused multi-analysis scan scheduler.
+
+Each registered analysis declares the per-cell accumulators it needs and a
+finish function that labels or shapes the accumulated state. run_analyses
+takes the union of the requested analyses' accumulators, walks sales_data
+exactly once (validating every amount once), and then finishes each
+analysis from the shared state.
+
+    results = run_analyses(sales_data, ["regional", "product", "pivot", "anomaly"])
+"""
+
+from anomaly import DEFAULT_THRESHOLD, Anomaly, RunningMoments
+from aggregation import label_products, label_regions, validate_amount
+from pivot import Pivot
+
+
+class RegionTotals:
+    """Total per region; regions without products total 0"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def begin_region(self, region):
+        self.totals[region] = 0
+
+    def add(self, region, product, amount):
+        self.totals[region] += amount
+
+    def result(self):
+        return self.totals
+
+
+class ProductTotals:
+    """Total per product in first-seen order"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def begin_region(self, region):
+        pass
+
+    def add(self, region, product, amount):
+        self.totals[product] = self.totals.get(product, 0) + amount
+
+    def result(self):
+        return self.totals
+
+
+class Cells:
+    """Copy of every cell in the nested layout"""
+
+    def __init__(self):
+        self.cells = {}
+
+    def begin_region(self, region):
+        self.cells[region] = {}
+
+    def add(self, region, product, amount):
+        self.cells[region][product] = amount
+
+    def result(self):
+        return self.cells
+
+
+class ProductMoments:
+    """Running mean/variance of each product across regions"""
+
+    def __init__(self):
+        self.moments = {}
+
+    def begin_region(self, region):
+        pass
+
+    def add(self, region, product, amount):
+        moments = self.moments.get(product)
+        if moments is None:
+            moments = self.moments[product] = RunningMoments()
+        moments.add(amount)
+
+    def result(self):
+        return self.moments
+
+
+ACCUMULATORS = {
+    "region_totals": RegionTotals,
+    "product_totals": ProductTotals,
+    "cells": Cells,
+    "product_moments": ProductMoments,
+}
+
+_ANALYSES = {}
+
+
+def register_analysis(name, needs, finish):
+    """
+    Register an analysis
+    needs: accumulator names from ACCUMULATORS
+    finish: callable taking {accumulator name: result} and returning the analysis result
+    """
+    unknown = [need for need in needs if need not in ACCUMULATORS]
+    if unknown:
+        raise ValueError(f"Unknown accumulators for {name!r}: {unknown}")
+    _ANALYSES[name] = (tuple(needs), finish)
+
+
+def registered_analyses():
+    return list(_ANALYSES)
+
+
+def run_analyses(sales_data, names=None):
+    """
+    Run the named analyses (all registered by default) in one traversal
+    Return: {analysis name: result}
+    """
+    if sales_data is None:
+        raise TypeError("sales_data cannot be None")
+    names = list(_ANALYSES) if names is None else list(names)
+    missing = [name for name in names if name not in _ANALYSES]
+    if missing:
+        raise KeyError(f"Unknown analyses: {missing}")
+
+    needed = []
+    for name in names:
+        for need in _ANALYSES[name][0]:
+            if need not in needed:
+                needed.append(need)
+    accumulators = [ACCUMULATORS[need]() for need in needed]
+
+    for region, products in sales_data.items():
+        for accumulator in accumulators:
+            accumulator.begin_region(region)
+        for product, amount in products.items():
+            validate_amount(amount)
+            for accumulator in accumulators:
+                accumulator.add(region, product, amount)
+
+    state = {need: accumulator.result() for need, accumulator in zip(needed, accumulators)}
+    return {name: _ANALYSES[name][1](state) for name in names}
+
+
+def _finish_pivot(state):
+    region_totals = state["region_totals"]
+    product_totals = state["product_totals"]
+    grand_total = 0
+    for total in region_totals.values():
+        grand_total += total
+    return Pivot(list(region_totals), list(product_totals), state["cells"],
+                 region_totals, product_totals, grand_total)
+
+
+def _finish_anomaly(state):
+    moments = state["product_moments"]
+    anomalies = []
+    for region, products in state["cells"].items():
+        for product, amount in products.items():
+            score = moments[product].score(amount)
+            if abs(score) >= DEFAULT_THRESHOLD:
+                anomalies.append(Anomaly(region, product, amount, score))
+    anomalies.sort(key=lambda x: abs(x.score), reverse=True)
+    return anomalies
+
+
+register_analysis("regional", ("region_totals",), lambda state: label_regions(state["region_totals"]))
+register_analysis("product", ("product_totals",), lambda state: label_products(state["product_totals"]))
+register_analysis("pivot", ("cells", "region_totals", "product_totals"), _finish_pivot)
+register_analysis("anomaly", ("cells", "product_moments"), _finish_anomaly)
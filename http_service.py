@@ -0,0 +1,184 @@
+"""
+Local HTTP service mode for dashboards.
+
+Serves the regional and product analyses as JSON from one shared
+SnapshotEngine, so every dashboard polls a single process instead of running
+its own copy of the console app:
+
+    GET /regional   analyze_regional_sales results
+    GET /product    analyze_product_performance results
+    GET /version    current dataset version
+
+Response bodies are rendered once per dataset version and cached together
+with a strong ETag; a request whose If-None-Match matches gets a 304 with no
+body. The server speaks HTTP/1.1, so clients can keep connections alive.
+Given a MetricsRegistry, response cache lookups are recorded per endpoint as
+http_regional, http_product and http_version.
+
+Usage: python http_service.py <sales.csv> [port]
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from snapshot_engine import SnapshotEngine
+
+ENDPOINTS = ("regional", "product", "version")
+
+
+def render_body(snapshot, endpoint):
+    """JSON body for one endpoint of one snapshot"""
+    if endpoint == "regional":
+        rows = [{"region": region, "total": total, "label": label}
+                for region, (total, label) in snapshot.regional_results().items()]
+    elif endpoint == "product":
+        rows = [{"product": product, "total": total, "label": label}
+                for product, (total, label) in snapshot.product_results().items()]
+    else:
+        rows = None
+    document = {"version": snapshot.version}
+    if rows is not None:
+        document["results"] = rows
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """Rendered (etag, body) per endpoint for the latest dataset version"""
+
+    def __init__(self, engine, registry=None):
+        self.engine = engine
+        self.registry = registry
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, endpoint):
+        snapshot = self.engine.snapshot()
+        with self._lock:
+            if snapshot.version != self._version:
+                self._version = snapshot.version
+                self._entries = {}
+            entry = self._entries.get(endpoint)
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.registry is not None:
+            self.registry.record_cache(f"http_{endpoint}", entry is not None)
+        if entry is not None:
+            return entry
+        body = render_body(snapshot, endpoint)
+        entry = ('"' + hashlib.sha1(body).hexdigest()[:20] + '"', body)
+        with self._lock:
+            if snapshot.version == self._version:
+                self._entries[endpoint] = entry
+        return entry
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    """GET handler backed by the server's ResponseCache"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        endpoint = self.path.split("?", 1)[0].strip("/")
+        if endpoint not in ENDPOINTS:
+            self._send(404, b'{"error":"not found"}')
+            return
+        etag, body = self.server.cache.get(endpoint)
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self._send(304, None, etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SalesService:
+    """Threaded HTTP server over a SnapshotEngine"""
+
+    def __init__(self, engine, host="127.0.0.1", port=0, registry=None):
+        self.engine = engine
+        self.server = ThreadingHTTPServer((host, port), ResultsHandler)
+        self.server.daemon_threads = True
+        self.server.cache = ResponseCache(engine, registry)
+        self._thread = None
+
+    @property
+    def cache(self):
+        return self.server.cache
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    """Serve a sales export: python http_service.py <sales.csv> [port]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python http_service.py <sales.csv> [port]")
+        return 1
+    try:
+        port = int(argv[1]) if len(argv) > 1 else 8000
+    except ValueError:
+        print("Invalid port. Please enter a whole number.")
+        return 1
+    try:
+        from sales_file import read_sales_file
+        service = SalesService(SnapshotEngine(read_sales_file(argv[0])), port=port)
+        print(f"Serving sales analyses on {service.url}")
+        service.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped serving.")
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Lazy product results.
+
+LazyProductResults is a read-only Mapping with the same contents as
+analyze_product_performance: each (total, label) tuple is built only when
+that product is looked up. The Top/Bottom products are found with one linear
+pass over the totals instead of a sort, using the same tie rules as the
+sorted ranking (first of the highest, last of the lowest). Totals come from
+an already maintained source (anything with a product_totals mapping, such
+as SalesTotals or a Snapshot) or from a single pass over sales_data.
+
+Iteration follows first-seen product order rather than rank order; a fully
+iterated mapping compares equal to the eager dict. The extremes are fixed
+when the mapping is built, so build a new one after the source changes.
+"""
+
+from collections.abc import Mapping
+
+from aggregation import BOTTOM_PRODUCT_LABEL, TOP_PRODUCT_LABEL, validate_amount
+
+
+def _product_totals(sales_data):
+    totals = {}
+    for region, products in sales_data.items():
+        for product, amount in products.items():
+            validate_amount(amount)
+            totals[product] = totals.get(product, 0) + amount
+    return totals
+
+
+class LazyProductResults(Mapping):
+    """Read-only {product: (total, label)} computed per key on access"""
+
+    def __init__(self, source):
+        if source is None:
+            raise TypeError("sales_data cannot be None")
+        totals = getattr(source, "product_totals", None)
+        self._totals = totals if totals is not None else _product_totals(source)
+        self._top, self._bottom = self._extremes()
+
+    def _extremes(self):
+        """Linear scan equivalent to taking the ends of the sorted ranking"""
+        top = bottom = None
+        top_total = bottom_total = None
+        for product, total in self._totals.items():
+            if top is None or total > top_total:
+                top, top_total = product, total
+            if bottom is None or total <= bottom_total:
+                bottom, bottom_total = product, total
+        if bottom == top:
+            bottom = None
+        return top, bottom
+
+    def label(self, product):
+        if product == self._top:
+            return TOP_PRODUCT_LABEL
+        if product == self._bottom:
+            return BOTTOM_PRODUCT_LABEL
+        return ""
+
+    def __getitem__(self, product):
+        return self._totals[product], self.label(product)
+
+    def __contains__(self, product):
+        return product in self._totals
+
+    def __iter__(self):
+        return iter(self._totals)
+
+    def __len__(self):
+        return len(self._totals)
+
+    def __repr__(self):
+        return f"LazyProductResults({len(self)} products, top={self._top!r}, bottom={self._bottom!r})"
+
+
+def lazy_product_performance(sales_data):
+    """Lazy counterpart of analyze_product_performance"""
+    return LazyProductResults(sales_data)
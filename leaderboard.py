@@ -0,0 +1,184 @@
+"""
+Live product leaderboard backed by an indexed skip list.
+
+Every link in the skip list stores how many entries it spans, which gives
+O(log n) expected time for updates, rank lookups and rank range slices.
+Products are ordered exactly like analyze_product_performance: by total,
+highest first, with ties kept in the order products were first seen.
+"""
+
+import random
+
+from aggregation import BOTTOM_PRODUCT_LABEL, TOP_PRODUCT_LABEL
+
+MAX_LEVEL = 32
+
+
+class _Node:
+    __slots__ = ("key", "product", "next", "width")
+
+    def __init__(self, key, product, level):
+        self.key = key
+        self.product = product
+        self.next = [None] * level
+        self.width = [1] * level
+
+
+class ProductLeaderboard:
+    """Order-statistics ranking of products by total sales"""
+
+    def __init__(self, product_totals=None, seed=None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._keys = {}
+        self._sequence = {}
+        self._counter = 0
+        if product_totals:
+            for product, total in product_totals.items():
+                self.update(product, total)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, product):
+        return product in self._keys
+
+    def _random_level(self):
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < 0.5:
+            level += 1
+        return level
+
+    def _find(self, key):
+        """Return the predecessors at each level and their 0-based positions"""
+        update = [self._head] * MAX_LEVEL
+        positions = [-1] * MAX_LEVEL
+        node, position = self._head, -1
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            positions[level] = position
+        return update, positions
+
+    def _insert(self, key, product):
+        update, positions = self._find(key)
+        level = self._random_level()
+        if level > self._level:
+            for extra in range(self._level, level):
+                update[extra] = self._head
+                positions[extra] = -1
+                self._head.width[extra] = self._size + 1
+            self._level = level
+        node = _Node(key, product, level)
+        index = positions[0] + 1
+        for i in range(level):
+            prev = update[i]
+            node.next[i] = prev.next[i]
+            prev.next[i] = node
+            skipped = index - positions[i] - 1
+            node.width[i] = prev.width[i] - skipped
+            prev.width[i] = skipped + 1
+        for i in range(level, self._level):
+            update[i].width[i] += 1
+        self._size += 1
+
+    def _delete(self, key):
+        update, _ = self._find(key)
+        node = update[0].next[0]
+        for i in range(self._level):
+            prev = update[i]
+            if prev.next[i] is node:
+                prev.width[i] += node.width[i] - 1
+                prev.next[i] = node.next[i]
+            else:
+                prev.width[i] -= 1
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def update(self, product, total):
+        """Set a product's total, inserting it if it is new"""
+        key = self._keys.get(product)
+        if key is not None:
+            self._delete(key)
+        sequence = self._sequence.get(product)
+        if sequence is None:
+            sequence = self._sequence[product] = self._counter
+            self._counter += 1
+        key = (-total, sequence)
+        self._keys[product] = key
+        self._insert(key, product)
+
+    def add(self, product, amount):
+        """Add a sale amount to a product's running total"""
+        self.update(product, self.total(product) + amount if product in self._keys else amount)
+
+    def remove(self, product):
+        """Drop a product from the ranking"""
+        self._delete(self._keys.pop(product))
+        del self._sequence[product]
+
+    def total(self, product):
+        return -self._keys[product][0]
+
+    def rank(self, product):
+        """1-based rank of a product; rank 1 is the top product"""
+        _, positions = self._find(self._keys[product])
+        return positions[0] + 2
+
+    def first_rank_with_total(self, total):
+        """1-based rank of the earliest-added entry with this total, or None"""
+        _, positions = self._find((-total, -1))
+        rank = positions[0] + 2
+        if rank > self._size or self._node_at(rank - 1).key[0] != -total:
+            return None
+        return rank
+
+    def _node_at(self, index):
+        node, position = self._head, -1
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and position + node.width[level] <= index:
+                position += node.width[level]
+                node = node.next[level]
+        return node
+
+    def label(self, product):
+        """Label consistent with analyze_product_performance"""
+        return self._label_for(self.rank(product))
+
+    def _label_for(self, rank):
+        if rank == 1:
+            return TOP_PRODUCT_LABEL
+        if rank == self._size:
+            return BOTTOM_PRODUCT_LABEL
+        return ""
+
+    def ranked(self, first, last):
+        """
+        Entries ranked first..last inclusive (1-based)
+        Return: list of (rank, product, total, label)
+        """
+        first = max(first, 1)
+        last = min(last, self._size)
+        if first > last:
+            return []
+        node = self._node_at(first - 1)
+        entries = []
+        for rank in range(first, last + 1):
+            entries.append((rank, node.product, -node.key[0], self._label_for(rank)))
+            node = node.next[0]
+        return entries
+
+    def top(self, count=1):
+        return self.ranked(1, count)
+
+    def bottom(self, count=1):
+        return self.ranked(self._size - count + 1, self._size)
+
+    def results(self):
+        """Full ranking in the analyze_product_performance result shape"""
+        return {product: (total, label) for _, product, total, label in self.ranked(1, self._size)}
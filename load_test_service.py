@@ -0,0 +1,91 @@
+"""
+Load test for the local HTTP service over keep-alive connections.
+
+Each client thread holds one persistent connection and alternates between
+/regional and /product, revalidating with If-None-Match, while a writer
+publishes a new dataset version every update_interval seconds.
+
+Usage: python load_test_service.py [clients] [seconds] [regions] [products] [update_interval]
+"""
+
+import http.client
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bench_snapshot_engine import make_sales_data
+from http_service import SalesService
+from snapshot_engine import SnapshotEngine
+
+
+def run(url, clients, seconds):
+    """Return {status: count} for requests completed within the time budget"""
+    parts = urlsplit(url)
+    stop = threading.Event()
+    counts = [{} for _ in range(clients)]
+
+    def client(index):
+        connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        etags = {}
+        local = counts[index]
+        while not stop.is_set():
+            for path in ("/regional", "/product"):
+                headers = {"If-None-Match": etags[path]} if path in etags else {}
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status == 200:
+                    etags[path] = response.getheader("ETag")
+                local[response.status] = local.get(response.status, 0) + 1
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    totals = {}
+    for local in counts:
+        for status, count in local.items():
+            totals[status] = totals.get(status, 0) + count
+    return totals
+
+
+def main():
+    """Start a local service, hammer it and print request rates"""
+    args = sys.argv[1:]
+    clients, seconds, regions, products = ([int(arg) for arg in args[:4]] + [8, 3, 50, 200][len(args[:4]):])[:4]
+    update_interval = float(args[4]) if len(args) > 4 else 0.5
+    engine = SnapshotEngine(make_sales_data(regions, products))
+    stop = threading.Event()
+
+    def writer():
+        rng = random.Random(7)
+        while not stop.wait(update_interval):
+            engine.set_amount(f"Region{rng.randrange(regions)}",
+                              f"Product{rng.randrange(products)}", rng.randint(0, 1000))
+
+    with SalesService(engine) as service:
+        updates = threading.Thread(target=writer)
+        updates.start()
+        totals = run(service.url, clients, seconds)
+        stop.set()
+        updates.join()
+        cache = service.cache
+
+    requests = sum(totals.values())
+    print("=" * 60)
+    print(f"{'Requests/s':<30}{requests / seconds:>30,.0f}")
+    print(f"{'200 OK':<30}{totals.get(200, 0):>30,}")
+    print(f"{'304 Not Modified':<30}{totals.get(304, 0):>30,}")
+    print(f"{'Cache hits / misses':<30}{f'{cache.hits:,} / {cache.misses:,}':>30}")
+    print(f"{'Dataset versions':<30}{engine.version:>30,}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
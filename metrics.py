@@ -0,0 +1,212 @@
+"""
+Metrics for the analysis functions in long-lived services.
+
+A MetricsRegistry keeps per-analysis call counts, latency histograms, cells
+processed and cache hit/miss counts. Recording is a perf_counter pair, one
+bisect into fixed buckets and a few integer increments under a lock.
+PrometheusFileExporter periodically writes the Prometheus text format to a
+file atomically, for the node exporter textfile collector.
+
+    registry = MetricsRegistry()
+    instrument_module(skeleton, registry)
+    engine = SnapshotEngine(sales_data, registry=registry)
+    PrometheusFileExporter(registry, "/var/lib/node_exporter/sales.prom").start()
+
+Cache lookups are reported by the caches themselves: SnapshotEngine records
+whether each analysis read hit the snapshot's cached results, and the HTTP
+service's ResponseCache records per-endpoint hits.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+INSTRUMENTED_FUNCTIONS = ("analyze_regional_sales", "analyze_product_performance", "display_results")
+
+
+def count_cells(data):
+    """Number of region/product cells in sales_data or a results dict"""
+    if not isinstance(data, dict):
+        return 0
+    cells = 0
+    for value in data.values():
+        cells += len(value) if isinstance(value, dict) else 1
+    return cells
+
+
+class _Analysis:
+    __slots__ = ("calls", "errors", "cells", "latency_sum", "buckets", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cells = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+
+class MetricsRegistry:
+    """Thread-safe per-analysis counters and latency histograms"""
+
+    def __init__(self, prefix="sales_analysis"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._analyses = {}
+
+    def _get(self, analysis):
+        metrics = self._analyses.get(analysis)
+        if metrics is None:
+            metrics = self._analyses.setdefault(analysis, _Analysis())
+        return metrics
+
+    def observe(self, analysis, seconds, cells=0, error=False):
+        """Record one call"""
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._get(analysis)
+            metrics.calls += 1
+            metrics.cells += cells
+            metrics.latency_sum += seconds
+            metrics.buckets[bucket] += 1
+            if error:
+                metrics.errors += 1
+
+    def record_cache(self, analysis, hit):
+        """Record a cache lookup for an analysis"""
+        with self._lock:
+            metrics = self._get(analysis)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def snapshot(self):
+        """Copy of the metrics as plain dicts"""
+        with self._lock:
+            return {
+                analysis: {
+                    "calls": m.calls, "errors": m.errors, "cells": m.cells,
+                    "latency_sum": m.latency_sum, "buckets": list(m.buckets),
+                    "cache_hits": m.cache_hits, "cache_misses": m.cache_misses,
+                }
+                for analysis, m in self._analyses.items()
+            }
+
+    def render(self):
+        """Prometheus text exposition format"""
+        prefix = self.prefix
+        snapshot = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(samples)
+
+        def label(analysis, **extra):
+            pairs = [f'analysis="{analysis}"'] + [f'{key}="{value}"' for key, value in extra.items()]
+            return "{" + ",".join(pairs) + "}"
+
+        family("calls_total", "counter", "Analysis calls.",
+               [f"{prefix}_calls_total{label(a)} {m['calls']}" for a, m in snapshot.items()])
+        family("errors_total", "counter", "Analysis calls that raised.",
+               [f"{prefix}_errors_total{label(a)} {m['errors']}" for a, m in snapshot.items()])
+        family("cells_processed_total", "counter", "Region/product cells processed.",
+               [f"{prefix}_cells_processed_total{label(a)} {m['cells']}" for a, m in snapshot.items()])
+        family("cells_per_second", "gauge", "Cells processed per second of analysis time.",
+               [f"{prefix}_cells_per_second{label(a)} {m['cells'] / m['latency_sum'] if m['latency_sum'] else 0.0}"
+                for a, m in snapshot.items()])
+
+        samples = []
+        for analysis, m in snapshot.items():
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, m["buckets"]):
+                cumulative += count
+                samples.append(f"{prefix}_latency_seconds_bucket{label(analysis, le=bound)} {cumulative}")
+            samples.append(f"{prefix}_latency_seconds_bucket{label(analysis, le='+Inf')} {m['calls']}")
+            samples.append(f"{prefix}_latency_seconds_sum{label(analysis)} {m['latency_sum']}")
+            samples.append(f"{prefix}_latency_seconds_count{label(analysis)} {m['calls']}")
+        family("latency_seconds", "histogram", "Analysis latency.", samples)
+
+        family("cache_requests_total", "counter", "Cache lookups by result.",
+               [line for a, m in snapshot.items() for line in (
+                   f"{prefix}_cache_requests_total{label(a, result='hit')} {m['cache_hits']}",
+                   f"{prefix}_cache_requests_total{label(a, result='miss')} {m['cache_misses']}")])
+        family("cache_hit_ratio", "gauge", "Cache hits over lookups.",
+               [f"{prefix}_cache_hit_ratio{label(a)} "
+                f"{m['cache_hits'] / (m['cache_hits'] + m['cache_misses']) if m['cache_hits'] + m['cache_misses'] else 0.0}"
+                for a, m in snapshot.items()])
+        return "\n".join(lines) + "\n"
+
+
+def instrument(func, registry, analysis=None):
+    """Wrap func so each call is timed and counted"""
+    analysis = analysis or func.__name__
+    perf_counter = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            registry.observe(analysis, perf_counter() - started, error=True)
+            raise
+        registry.observe(analysis, perf_counter() - started, count_cells(args[0]) if args else 0)
+        return result
+
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def instrument_module(module, registry, names=INSTRUMENTED_FUNCTIONS):
+    """Replace the analysis functions of a module (e.g. skeleton) with instrumented ones"""
+    for name in names:
+        func = getattr(module, name)
+        if getattr(func, "__wrapped__", None) is None:
+            setattr(module, name, instrument(func, registry, name))
+    return module
+
+
+class PrometheusFileExporter:
+    """Background thread that rewrites a .prom file every interval seconds"""
+
+    def __init__(self, registry, path, interval=15.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def dump(self):
+        """Write the current metrics atomically"""
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as file:
+            file.write(self.registry.render())
+        os.replace(temporary, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the thread and write a final dump"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.dump()
@@ -0,0 +1,149 @@
+"""
+Multi-metric sales cells in a struct-of-arrays layout.
+
+Each region/product cell carries units, revenue and cost. Instead of a tuple
+or dict per cell, the dataset keeps one contiguous array per field: the
+region index, the product index and each metric. One pass over the zipped
+arrays accumulates every metric per region and per product at once, and
+derived metrics such as margin are computed from those totals. Either
+analysis can then rank by any stored or derived metric without rescanning
+the cells.
+
+    dataset = MultiMetricSales.from_sales_data(
+        {"North": {"Product A": (10, 1200.0, 800.0)}})
+    dataset.product_results("margin")
+"""
+
+from array import array
+
+from aggregation import label_products, label_regions, validate_amount
+
+METRICS = ("units", "revenue", "cost")
+
+
+def _margin(totals):
+    return totals["revenue"] - totals["cost"]
+
+
+def _margin_percent(totals):
+    return (totals["revenue"] - totals["cost"]) / totals["revenue"] * 100 if totals["revenue"] else 0.0
+
+
+DERIVED_METRICS = {
+    "margin": _margin,
+    "margin_percent": _margin_percent,
+}
+
+
+class MetricTotals:
+    """Per-region and per-product totals of every metric from one pass"""
+
+    def __init__(self, regions, products):
+        self.regions = regions
+        self.products = products
+
+    @staticmethod
+    def _values(totals, metric):
+        if metric in METRICS:
+            return {name: metrics[metric] for name, metrics in totals.items()}
+        if metric in DERIVED_METRICS:
+            derive = DERIVED_METRICS[metric]
+            return {name: derive(metrics) for name, metrics in totals.items()}
+        raise KeyError(f"Unknown metric: {metric!r}")
+
+    def region_values(self, metric):
+        return self._values(self.regions, metric)
+
+    def product_values(self, metric):
+        return self._values(self.products, metric)
+
+
+class MultiMetricSales:
+    """Region/product cells with one array per field"""
+
+    def __init__(self):
+        self.regions = []
+        self.products = []
+        self._region_index = {}
+        self._product_index = {}
+        self.region_ids = array("l")
+        self.product_ids = array("l")
+        self.units = array("q")
+        self.revenue = array("d")
+        self.cost = array("d")
+        self._totals = None
+
+    @classmethod
+    def from_sales_data(cls, sales_data):
+        """Build from {region: {product: (units, revenue, cost)}}"""
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        dataset = cls()
+        for region, products in sales_data.items():
+            dataset._intern(region, dataset.regions, dataset._region_index)
+            for product, (units, revenue, cost) in products.items():
+                dataset.add(region, product, units, revenue, cost)
+        return dataset
+
+    @staticmethod
+    def _intern(name, names, index):
+        position = index.get(name)
+        if position is None:
+            position = index[name] = len(names)
+            names.append(name)
+        return position
+
+    def __len__(self):
+        return len(self.units)
+
+    def add(self, region, product, units, revenue, cost):
+        """Append one cell"""
+        if isinstance(units, bool) or not isinstance(units, int):
+            raise TypeError(f"Units must be a whole number, got {type(units).__name__}")
+        validate_amount(units)
+        validate_amount(revenue)
+        validate_amount(cost)
+        self.region_ids.append(self._intern(region, self.regions, self._region_index))
+        self.product_ids.append(self._intern(product, self.products, self._product_index))
+        self.units.append(units)
+        self.revenue.append(revenue)
+        self.cost.append(cost)
+        self._totals = None
+
+    def totals(self):
+        """All metrics per region and per product, from a single pass"""
+        if self._totals is not None:
+            return self._totals
+        region_units = [0] * len(self.regions)
+        region_revenue = [0.0] * len(self.regions)
+        region_cost = [0.0] * len(self.regions)
+        product_units = [0] * len(self.products)
+        product_revenue = [0.0] * len(self.products)
+        product_cost = [0.0] * len(self.products)
+        for region, product, units, revenue, cost in zip(self.region_ids, self.product_ids,
+                                                         self.units, self.revenue, self.cost):
+            region_units[region] += units
+            region_revenue[region] += revenue
+            region_cost[region] += cost
+            product_units[product] += units
+            product_revenue[product] += revenue
+            product_cost[product] += cost
+        seen = set(self.product_ids)
+        regions = {
+            name: {"units": region_units[i], "revenue": region_revenue[i], "cost": region_cost[i]}
+            for i, name in enumerate(self.regions)
+        }
+        products = {
+            name: {"units": product_units[i], "revenue": product_revenue[i], "cost": product_cost[i]}
+            for i, name in enumerate(self.products) if i in seen
+        }
+        self._totals = MetricTotals(regions, products)
+        return self._totals
+
+    def regional_results(self, metric="revenue"):
+        """analyze_regional_sales shape, ranked by metric"""
+        return label_regions(self.totals().region_values(metric))
+
+    def product_results(self, metric="revenue"):
+        """analyze_product_performance shape, ranked by metric"""
+        return label_products(self.totals().product_values(metric))
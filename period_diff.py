@@ -0,0 +1,121 @@
+"""
+Period-over-period diff of two sales_data snapshots.
+
+Both snapshots are laid out as SalesMatrix buffers on one shared region and
+product index (previous order first), then differenced cell by cell in a
+single pass that also accumulates both sides' region and product totals, so
+cell-level changes come with the totals at no extra cost. Names present in
+only one snapshot are reported as added or removed. The biggest movers are selected with bounded heaps, so ranking costs
+O(n log k) rather than a full sort.
+"""
+
+import heapq
+from collections import namedtuple
+
+from sales_matrix import INT, MISSING, SalesMatrix
+
+Change = namedtuple("Change", "previous current change percent status")
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+
+def _shared_index(previous_data, current_data):
+    """Union of both snapshots' regions and products, previous order first"""
+    regions = dict.fromkeys(previous_data)
+    regions.update(dict.fromkeys(current_data))
+    products = {}
+    for sales_data in (previous_data, current_data):
+        for amounts in sales_data.values():
+            products.update(dict.fromkeys(amounts))
+    return list(regions), list(products)
+
+
+def _amount(values, kinds, index):
+    kind = kinds[index]
+    if kind == MISSING:
+        return None
+    if kind == INT:
+        return int(values[index])
+    return values[index]
+
+
+def _change(old, new):
+    if old is None:
+        return Change(None, new, new, None, ADDED)
+    if new is None:
+        return Change(old, None, -old, None, REMOVED)
+    delta = new - old
+    percent = delta / old * 100 if old else None
+    return Change(old, new, delta, percent, CHANGED if delta else UNCHANGED)
+
+
+class PeriodDiff:
+    """Aligned regional, product and (region, product) cell changes between two snapshots"""
+
+    def __init__(self, previous_data, current_data):
+        regions, products = _shared_index(previous_data, current_data)
+        previous = SalesMatrix.from_sales_data(previous_data, regions, products)
+        current = SalesMatrix.from_sales_data(current_data, regions, products)
+        old_values, old_kinds = previous.values, previous.kinds
+        new_values, new_kinds = current.values, current.kinds
+        width = len(products)
+        old_columns, new_columns = [0] * width, [0] * width
+        old_seen, new_seen = [False] * width, [False] * width
+
+        self.regions = {}
+        self.cells = {}
+        for row, region in enumerate(regions):
+            base = row * width
+            old_row = new_row = 0
+            for col in range(width):
+                index = base + col
+                if old_kinds[index] == MISSING and new_kinds[index] == MISSING:
+                    continue
+                old = _amount(old_values, old_kinds, index)
+                new = _amount(new_values, new_kinds, index)
+                if old is not None:
+                    old_row += old
+                    old_columns[col] += old
+                    old_seen[col] = True
+                if new is not None:
+                    new_row += new
+                    new_columns[col] += new
+                    new_seen[col] = True
+                self.cells[(region, products[col])] = _change(old, new)
+            self.regions[region] = _change(old_row if region in previous_data else None,
+                                           new_row if region in current_data else None)
+        self.products = {product: _change(old_columns[col] if old_seen[col] else None,
+                                          new_columns[col] if new_seen[col] else None)
+                         for col, product in enumerate(products)}
+
+    def _select(self, kind):
+        if kind == "region":
+            return self.regions
+        if kind == "product":
+            return self.products
+        if kind == "cell":
+            return self.cells
+        raise ValueError(f"kind must be 'region', 'product' or 'cell', got {kind!r}")
+
+    def biggest_movers(self, kind="product", count=5):
+        """Largest absolute changes, biggest first"""
+        changes = self._select(kind)
+        return heapq.nlargest(count, changes.items(), key=lambda x: abs(x[1].change))
+
+    def top_gainers(self, kind="product", count=5):
+        changes = self._select(kind)
+        return heapq.nlargest(count, changes.items(), key=lambda x: x[1].change)
+
+    def top_decliners(self, kind="product", count=5):
+        changes = self._select(kind)
+        return heapq.nsmallest(count, changes.items(), key=lambda x: x[1].change)
+
+
+def diff_sales(previous_data, current_data):
+    """Compare two snapshots of sales_data"""
+    if previous_data is None or current_data is None:
+        raise TypeError("sales_data cannot be None")
+    return PeriodDiff(previous_data, current_data)
@@ -0,0 +1,112 @@
+"""
+Region x product pivot with margins and shares from a single scan.
+
+One pass over sales_data fills the cell matrix and accumulates the row
+(region) and column (product) totals at the same time; each cell's share of
+its region and of its product is then derived from those margins without
+touching sales_data again. display_pivot streams the table row by row.
+"""
+
+import sys
+
+from aggregation import validate_amount
+
+PIVOT_ANALYSIS = "Region x Product Pivot"
+
+
+class Pivot:
+    """Cross-tab of sales with row/column totals and shares"""
+
+    def __init__(self, regions, products, cells, region_totals, product_totals, grand_total):
+        self.regions = regions
+        self.products = products
+        self.cells = cells
+        self.region_totals = region_totals
+        self.product_totals = product_totals
+        self.grand_total = grand_total
+
+    def amount(self, region, product):
+        return self.cells[region].get(product, 0)
+
+    def region_share(self, region, product):
+        """Cell as a fraction of its region's total"""
+        total = self.region_totals[region]
+        return self.amount(region, product) / total if total else 0.0
+
+    def product_share(self, region, product):
+        """Cell as a fraction of its product's total"""
+        total = self.product_totals[product]
+        return self.amount(region, product) / total if total else 0.0
+
+    def rows(self):
+        """Yield (region, [(amount, region share, product share), ...], row total)"""
+        for region in self.regions:
+            row_total = self.region_totals[region]
+            cells = self.cells[region]
+            entries = []
+            for product in self.products:
+                amount = cells.get(product, 0)
+                product_total = self.product_totals[product]
+                entries.append((amount,
+                                amount / row_total if row_total else 0.0,
+                                amount / product_total if product_total else 0.0))
+            yield region, entries, row_total
+
+
+def analyze_pivot(sales_data):
+    """
+    Build the full region x product pivot in one scan of sales_data
+    Return: Pivot
+    """
+    if sales_data is None:
+        raise TypeError("sales_data cannot be None")
+    regions = []
+    cells = {}
+    region_totals = {}
+    product_totals = {}
+    grand_total = 0
+    for region, products in sales_data.items():
+        regions.append(region)
+        row = cells[region] = {}
+        region_total = 0
+        for product, amount in products.items():
+            validate_amount(amount)
+            row[product] = amount
+            region_total += amount
+            product_totals[product] = product_totals.get(product, 0) + amount
+        region_totals[region] = region_total
+        grand_total += region_total
+    return Pivot(regions, list(product_totals), cells, region_totals, product_totals, grand_total)
+
+
+def display_pivot(pivot, values="amount", file=None):
+    """
+    Stream the pivot as a table; values is "amount", "region_share" or "product_share"
+    """
+    columns = {"amount": 0, "region_share": 1, "product_share": 2}
+    if values not in columns:
+        raise ValueError(f"values must be one of {sorted(columns)}, got {values!r}")
+    index = columns[values]
+    out = file or sys.stdout
+    name_width = max([len("Region")] + [len(str(region)) for region in pivot.regions]) + 2
+    cell_width = max([12] + [len(str(product)) + 2 for product in pivot.products])
+    width = name_width + cell_width * (len(pivot.products) + 1)
+
+    def fmt(value):
+        if index:
+            return f"{value:>{cell_width}.1%}"
+        return f"{value:>{cell_width},.2f}"
+
+    out.write("=" * width + "\n")
+    out.write(f"Data Analysis Tool - {PIVOT_ANALYSIS} ({values.replace('_', ' ')})\n")
+    out.write("=" * width + "\n")
+    header = "".join(f"{product:>{cell_width}}" for product in pivot.products)
+    out.write(f"{'Region':<{name_width}}{header}{'Total':>{cell_width}}\n")
+    out.write("-" * width + "\n")
+    for region, entries, row_total in pivot.rows():
+        line = "".join(fmt(entry[index]) for entry in entries)
+        out.write(f"{region:<{name_width}}{line}{row_total:>{cell_width},.2f}\n")
+    out.write("-" * width + "\n")
+    totals = "".join(f"{pivot.product_totals[product]:>{cell_width},.2f}" for product in pivot.products)
+    out.write(f"{'Total':<{name_width}}{totals}{pivot.grand_total:>{cell_width},.2f}\n")
+    out.write("=" * width + "\n")
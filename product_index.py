@@ -0,0 +1,52 @@
+"""
+Inverted product index.
+
+sales_data is keyed region-first, so answering "where does Product C sell,
+and how much?" means visiting every region. ProductIndex keeps the inverse
+mapping, product -> {region: amount}, next to the running totals of
+SalesTotals and updates both on every cell change. Product totals and
+per-product drill-downs then cost time proportional to the number of regions
+that sell the product, not the size of the dataset.
+"""
+
+from types import MappingProxyType
+
+from aggregation import SalesTotals
+
+
+class ProductIndex(SalesTotals):
+    """SalesTotals with a maintained product -> {region: amount} index"""
+
+    def __init__(self, sales_data=None):
+        self.products = {}
+        super().__init__(sales_data)
+
+    def set_amount(self, region, product, amount):
+        delta = super().set_amount(region, product, amount)
+        self.products.setdefault(product, {})[region] = amount
+        return delta
+
+    def remove_amount(self, region, product):
+        amount = super().remove_amount(region, product)
+        regions = self.products[product]
+        del regions[region]
+        if not regions:
+            del self.products[product]
+        return amount
+
+    def regions_for(self, product):
+        """Read-only {region: amount} for one product; KeyError if unknown"""
+        return MappingProxyType(self.products[product])
+
+    def product_total(self, product):
+        return self.product_totals[product]
+
+    def drill_down(self, product):
+        """
+        Where one product sells, largest region first
+        Return: list of (region, amount, share of the product total)
+        """
+        regions = self.products[product]
+        total = self.product_totals[product]
+        ranked = sorted(regions.items(), key=lambda x: x[1], reverse=True)
+        return [(region, amount, amount / total if total else 0.0) for region, amount in ranked]
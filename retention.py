@@ -0,0 +1,154 @@
+"""
+Tiered retention and downsampling for historical sales data.
+
+Every day of sales_data is reduced to region and product totals and folded
+into three tiers:
+
+    daily    one bucket per day, kept for the most recent daily_days
+    weekly   one bucket per week segment (Monday to Sunday, cut at month
+             boundaries so months are exact unions of segments), kept for
+             the most recent weekly_weeks
+    monthly  one bucket per calendar month, kept for max_months (or forever)
+
+Compaction happens automatically as newer days arrive: the retention
+horizons move forward and older daily and weekly buckets are dropped. Their
+data stays in the coarser tiers because every day is folded into all of
+them on arrival. A range query walks from its start date, taking a whole
+month where the month fits in the range, otherwise a week segment, otherwise
+a single day. A range that would need detail that has already been
+compacted away raises ValueError instead of returning an approximation.
+"""
+
+import calendar
+import datetime
+
+from aggregation import label_products, label_regions
+from rolling_window import period_totals
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def segment_start(day):
+    """First day of the week segment containing day"""
+    return max(day - datetime.timedelta(days=day.weekday()), month_start(day))
+
+
+def segment_end(day):
+    """Last day of the week segment containing day"""
+    return min(day + datetime.timedelta(days=6 - day.weekday()), month_end(day))
+
+
+def _merge(bucket, region_totals, product_totals):
+    regions, products = bucket
+    for region, total in region_totals.items():
+        regions[region] = regions.get(region, 0) + total
+    for product, total in product_totals.items():
+        products[product] = products.get(product, 0) + total
+
+
+class TieredSalesHistory:
+    """Daily, weekly and monthly totals with automatic compaction"""
+
+    def __init__(self, daily_days=35, weekly_weeks=26, max_months=None):
+        if daily_days < 1 or weekly_weeks < 1:
+            raise ValueError("Retention periods must be at least 1")
+        self.daily_days = daily_days
+        self.weekly_weeks = weekly_weeks
+        self.max_months = max_months
+        self.daily = {}
+        self.weekly = {}
+        self.monthly = {}
+        self.latest = None
+        self.daily_from = None
+        self.weekly_from = None
+        self.monthly_from = None
+
+    def add_day(self, day, sales_data):
+        """Fold one day of sales_data into every tier that still covers it"""
+        region_totals, product_totals = period_totals(sales_data)
+        if self.monthly_from is not None and day < self.monthly_from:
+            raise ValueError(f"{day} is older than the retained history")
+        if self.daily_from is None or day >= self.daily_from:
+            _merge(self.daily.setdefault(day, ({}, {})), region_totals, product_totals)
+        if self.weekly_from is None or day >= self.weekly_from:
+            _merge(self.weekly.setdefault(segment_start(day), ({}, {})), region_totals, product_totals)
+        _merge(self.monthly.setdefault(month_start(day), ({}, {})), region_totals, product_totals)
+        if self.latest is None or day > self.latest:
+            self.latest = day
+        self.compact()
+
+    def compact(self):
+        """Advance the retention horizons and drop buckets behind them"""
+        if self.latest is None:
+            return
+        daily_from = segment_start(self.latest - (self.daily_days - 1) * ONE_DAY)
+        weekly_from = month_start(self.latest - (7 * self.weekly_weeks - 1) * ONE_DAY)
+        weekly_from = min(weekly_from, daily_from)
+        if self.daily_from is None or daily_from > self.daily_from:
+            self.daily_from = daily_from
+            for day in [day for day in self.daily if day < daily_from]:
+                del self.daily[day]
+        if self.weekly_from is None or weekly_from > self.weekly_from:
+            self.weekly_from = weekly_from
+            for start in [start for start in self.weekly if start < weekly_from]:
+                del self.weekly[start]
+        if self.max_months is not None and len(self.monthly) > self.max_months:
+            for start in sorted(self.monthly)[:len(self.monthly) - self.max_months]:
+                del self.monthly[start]
+            self.monthly_from = min(self.monthly)
+            self.weekly_from = max(self.weekly_from, self.monthly_from)
+            self.daily_from = max(self.daily_from, self.monthly_from)
+
+    def buckets(self, start, end):
+        """
+        The coarsest buckets that exactly cover start..end (inclusive)
+        Return: list of (tier, bucket start, (region_totals, product_totals))
+        """
+        if end < start:
+            raise ValueError("Range end is before its start")
+        empty = ({}, {})
+        chosen = []
+        cursor = start
+        while cursor <= end:
+            if self.monthly_from is not None and cursor < self.monthly_from:
+                raise ValueError(f"{cursor} is older than the retained history")
+            if cursor == month_start(cursor) and month_end(cursor) <= end:
+                chosen.append(("monthly", cursor, self.monthly.get(cursor, empty)))
+                cursor = month_end(cursor) + ONE_DAY
+            elif (cursor == segment_start(cursor) and segment_end(cursor) <= end
+                  and (self.weekly_from is None or cursor >= self.weekly_from)):
+                chosen.append(("weekly", cursor, self.weekly.get(cursor, empty)))
+                cursor = segment_end(cursor) + ONE_DAY
+            elif self.daily_from is None or cursor >= self.daily_from:
+                chosen.append(("daily", cursor, self.daily.get(cursor, empty)))
+                cursor += ONE_DAY
+            else:
+                raise ValueError(f"{cursor} is only retained at a coarser granularity; "
+                                 "align the range to week or month boundaries")
+        return chosen
+
+    def totals(self, start, end):
+        """Return (region_totals, product_totals) for start..end (inclusive)"""
+        combined = ({}, {})
+        for _, _, (region_totals, product_totals) in self.buckets(start, end):
+            _merge(combined, region_totals, product_totals)
+        return combined
+
+    def regional_results(self, start, end):
+        """Same shape as analyze_regional_sales for the range"""
+        return label_regions(self.totals(start, end)[0])
+
+    def product_results(self, start, end):
+        """Same shape as analyze_product_performance for the range"""
+        return label_products(self.totals(start, end)[1])
+
+    def tier_sizes(self):
+        return {"daily": len(self.daily), "weekly": len(self.weekly), "monthly": len(self.monthly)}
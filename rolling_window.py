@@ -0,0 +1,146 @@
+"""
+Rolling-window regional and product analytics.
+
+Each period's sales_data is reduced once to per-period region and product
+totals, kept in a ring buffer. Sliding the window forward subtracts the
+expiring period's totals and adds the new period's, touching only the names
+present in those two periods. Rankings live in skip-list leaderboards, so
+the Highest/Lowest and Top/Bottom labels are maintained incrementally
+instead of re-scanning the window. Integer amounts stay exact under the
+subtract/add updates.
+
+    windows = RollingWindows((7, 30))
+    windows.push(todays_sales_data)
+    windows[7].regional_results()
+"""
+
+from aggregation import (BOTTOM_PRODUCT_LABEL, HIGHEST_REGION_LABEL, LOWEST_REGION_LABEL,
+                         TOP_PRODUCT_LABEL, validate_amount)
+from leaderboard import ProductLeaderboard
+
+
+def period_totals(sales_data):
+    """Reduce one period's sales_data to (region totals, product totals)"""
+    if sales_data is None:
+        raise TypeError("sales_data cannot be None")
+    region_totals = {}
+    product_totals = {}
+    for region, products in sales_data.items():
+        total = 0
+        for product, amount in products.items():
+            validate_amount(amount)
+            total += amount
+            product_totals[product] = product_totals.get(product, 0) + amount
+        region_totals[region] = total
+    return region_totals, product_totals
+
+
+class _RunningTotals:
+    """Window totals for one dimension with reference counts and a ranking"""
+
+    def __init__(self):
+        self.totals = {}
+        self.periods = {}
+        self.board = ProductLeaderboard()
+
+    def add(self, totals, sign):
+        for name, amount in totals.items():
+            if sign > 0:
+                self.totals[name] = self.totals.get(name, 0) + amount
+                self.periods[name] = self.periods.get(name, 0) + 1
+            else:
+                self.totals[name] -= amount
+                self.periods[name] -= 1
+            if self.periods[name]:
+                self.board.update(name, self.totals[name])
+            else:
+                del self.totals[name]
+                del self.periods[name]
+                self.board.remove(name)
+
+
+class RollingWindow:
+    """Regional and product totals over the last size periods"""
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError("Window size must be at least 1")
+        self.size = size
+        self._ring = [None] * size
+        self._next = 0
+        self._count = 0
+        self._regions = _RunningTotals()
+        self._products = _RunningTotals()
+
+    def __len__(self):
+        return self._count
+
+    def push_totals(self, region_totals, product_totals):
+        """Slide forward by one period given its precomputed totals"""
+        expiring = self._ring[self._next]
+        if expiring is not None:
+            self._regions.add(expiring[0], -1)
+            self._products.add(expiring[1], -1)
+        self._regions.add(region_totals, 1)
+        self._products.add(product_totals, 1)
+        self._ring[self._next] = (region_totals, product_totals)
+        self._next = (self._next + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def push(self, sales_data):
+        """Slide forward by one period of sales_data"""
+        self.push_totals(*period_totals(sales_data))
+
+    def highest_region(self):
+        top = self._regions.board.top()
+        return top[0][1] if top else None
+
+    def lowest_region(self):
+        """First-added region among those with the lowest total"""
+        board = self._regions.board
+        if not len(board):
+            return None
+        rank = board.first_rank_with_total(board.bottom()[0][2])
+        return board.ranked(rank, rank)[0][1]
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales for the window"""
+        highest, lowest = self.highest_region(), self.lowest_region()
+        results = {}
+        for region, total in self._regions.totals.items():
+            label = ""
+            if region == highest:
+                label = HIGHEST_REGION_LABEL
+            elif region == lowest:
+                label = LOWEST_REGION_LABEL
+            results[region] = (total, label)
+        return results
+
+    def product_results(self):
+        """Same shape as analyze_product_performance for the window"""
+        return self._products.board.results()
+
+    def top_product(self):
+        top = self._products.board.top()
+        return top[0][1] if top else None
+
+    def product_label(self, product):
+        if product not in self._products.board:
+            return None
+        label = self._products.board.label(product)
+        return label if label in (TOP_PRODUCT_LABEL, BOTTOM_PRODUCT_LABEL) else ""
+
+
+class RollingWindows:
+    """Several window sizes fed from one per-period reduction"""
+
+    def __init__(self, sizes=(7, 30)):
+        self.windows = {size: RollingWindow(size) for size in sizes}
+
+    def __getitem__(self, size):
+        return self.windows[size]
+
+    def push(self, sales_data):
+        totals = period_totals(sales_data)
+        for window in self.windows.values():
+            window.push_totals(*totals)
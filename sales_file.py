@@ -0,0 +1,58 @@
+"""
+Reading sales exports from disk.
+
+An export is a CSV file with one cell per line: region,product,amount
+An optional "region,product,amount" header line is skipped.
+"""
+
+import csv
+import math
+
+HEADER = ["region", "product", "amount"]
+
+
+def parse_amount(text):
+    """Parse an amount as int when it has no fractional part, float otherwise"""
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            amount = float(text)
+        except ValueError:
+            raise TypeError(f"Sales amount must be a number, got {text!r}")
+    if not math.isfinite(amount):
+        raise ValueError(f"Sales amount must be finite, got {text!r}")
+    return amount
+
+
+def parse_sales_lines(lines):
+    """Yield (region, product, amount) for each data line of an export"""
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        if [field.strip().lower() for field in row] == HEADER:
+            continue
+        if len(row) != 3:
+            raise ValueError(f"Expected region,product,amount but got {row}")
+        region, product, amount = row
+        yield region.strip(), product.strip(), parse_amount(amount)
+
+
+def read_sales_file(path):
+    """Load a whole export into the nested {region: {product: amount}} layout"""
+    sales_data = {}
+    with open(path, "r", newline="") as file:
+        for region, product, amount in parse_sales_lines(file):
+            sales_data.setdefault(region, {})[product] = amount
+    return sales_data
+
+
+def write_sales_file(path, sales_data):
+    """Write a nested sales_data dict as an export"""
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for region, products in sales_data.items():
+            for product, amount in products.items():
+                writer.writerow([region, product, amount])
@@ -0,0 +1,133 @@
+"""
+Region x product matrix layout of sales_data.
+
+Label tables (regions, products) plus two flat row-major arrays: the amounts
+as float64 and a per-cell kind code recording whether the cell is missing or
+held an int or a float, so totals come back with the same types the
+nested-loop analyses produce. Ints above 2**53 cannot be held exactly in a
+float64 and are rejected with OverflowError rather than silently rounded.
+"""
+
+from array import array
+
+from aggregation import label_products, label_regions, validate_amount
+
+MISSING = 0
+INT = 1
+FLOAT = 2
+
+MAX_EXACT_FLOAT_INT = 2 ** 53
+
+
+class SalesMatrix:
+    """Dense region x product view over flat value/kind buffers"""
+
+    def __init__(self, regions, products, values, kinds):
+        self.regions = list(regions)
+        self.products = list(products)
+        self.values = values
+        self.kinds = kinds
+
+    @classmethod
+    def from_sales_data(cls, sales_data, regions=None, products=None):
+        """
+        Build a matrix from the nested {region: {product: amount}} layout
+        regions and products fix the label tables, e.g. to lay several
+        snapshots out on one shared index; they must cover sales_data's
+        labels, and labels missing from sales_data become empty cells.
+        """
+        if sales_data is None:
+            raise TypeError("sales_data cannot be None")
+        if regions is None:
+            regions = list(sales_data)
+        if products is None:
+            column = {}
+            for region, amounts in sales_data.items():
+                for product in amounts:
+                    if product not in column:
+                        column[product] = len(column)
+        else:
+            column = {product: col for col, product in enumerate(products)}
+        row_of = {region: row for row, region in enumerate(regions)}
+        width = len(column)
+        values = array("d", bytes(8 * len(regions) * width))
+        kinds = array("b", bytes(len(regions) * width))
+        for region, amounts in sales_data.items():
+            base = row_of[region] * width
+            for product, amount in amounts.items():
+                validate_amount(amount)
+                if isinstance(amount, int) and amount > MAX_EXACT_FLOAT_INT:
+                    raise OverflowError(f"Sales amount {amount} in {region!r} cannot be stored exactly "
+                                        "in the float64 matrix")
+                index = base + column[product]
+                values[index] = amount
+                kinds[index] = FLOAT if isinstance(amount, float) else INT
+        return cls(regions, column, values, kinds)
+
+    @property
+    def shape(self):
+        return len(self.regions), len(self.products)
+
+    def cell(self, row, col):
+        """Return the amount at (row, col) with its original type, or None"""
+        index = row * len(self.products) + col
+        kind = self.kinds[index]
+        if kind == MISSING:
+            return None
+        if kind == INT:
+            return int(self.values[index])
+        return self.values[index]
+
+    def row_totals(self, start=0, stop=None):
+        """Totals for rows start..stop, keyed by region"""
+        width = len(self.products)
+        values, kinds = self.values, self.kinds
+        totals = {}
+        for row in range(start, len(self.regions) if stop is None else stop):
+            base = row * width
+            total = 0
+            for index in range(base, base + width):
+                kind = kinds[index]
+                if kind == INT:
+                    total += int(values[index])
+                elif kind == FLOAT:
+                    total += values[index]
+            totals[self.regions[row]] = total
+        return totals
+
+    def column_totals(self, start=0, stop=None):
+        """Per-product totals over rows start..stop, keyed by product"""
+        width = len(self.products)
+        values, kinds = self.values, self.kinds
+        totals = [0] * width
+        seen = [False] * width
+        for row in range(start, len(self.regions) if stop is None else stop):
+            base = row * width
+            for col in range(width):
+                kind = kinds[base + col]
+                if kind == INT:
+                    totals[col] += int(values[base + col])
+                elif kind == FLOAT:
+                    totals[col] += values[base + col]
+                if kind != MISSING:
+                    seen[col] = True
+        return {product: totals[col] for col, product in enumerate(self.products) if seen[col]}
+
+    def to_sales_data(self):
+        """Rebuild the nested sales_data layout"""
+        sales_data = {}
+        for row, region in enumerate(self.regions):
+            products = sales_data[region] = {}
+            for col, product in enumerate(self.products):
+                amount = self.cell(row, col)
+                if amount is not None:
+                    products[product] = amount
+        return sales_data
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales"""
+        return label_regions(self.row_totals())
+
+    def product_results(self):
+        """Same shape as analyze_product_performance"""
+        return label_products(self.column_totals())
@@ -0,0 +1,126 @@
+"""
+Vectorized what-if scenario engine.
+
+A scenario scales regions and/or products, e.g.
+    Scenario("North +5%, C -10%", regions={"North": 1.05}, products={"Product C": 0.90})
+
+The baseline region and product totals are computed once. A scenario with
+region multipliers m and product multipliers w is then applied as a sparse
+correction touching only the cells of the names it changes:
+    region total[r]  = m[r] * (row total[r] + sum over changed p of (w[p] - 1) * v[r, p])
+    product total[p] = w[p] * (column total[p] + sum over changed r of (m[r] - 1) * v[r, p])
+so a scenario changing k products and j regions costs O(R*k + P*j) instead
+of copying and re-analysing sales_data. Totals a scenario leaves alone keep
+the baseline's types, so int data stays int.
+"""
+
+from aggregation import (BOTTOM_PRODUCT_LABEL, HIGHEST_REGION_LABEL, LOWEST_REGION_LABEL,
+                         TOP_PRODUCT_LABEL, label_products, label_regions, validate_amount)
+from sales_matrix import SalesMatrix
+
+
+class Scenario:
+    """Named set of region and product multipliers; unlisted ones are 1.0"""
+
+    def __init__(self, name, regions=None, products=None):
+        self.name = name
+        self.regions = dict(regions or {})
+        self.products = dict(products or {})
+        for multiplier in list(self.regions.values()) + list(self.products.values()):
+            validate_amount(multiplier)
+
+
+class ScenarioResult:
+    """Totals and labels for one scenario"""
+
+    def __init__(self, name, regional, products):
+        self.name = name
+        self.regional = regional
+        self.products = products
+
+    def labelled(self, label):
+        """Name of the region or product carrying a label, or None"""
+        for results in (self.regional, self.products):
+            for name, (_, assigned) in results.items():
+                if assigned == label:
+                    return name
+        return None
+
+
+LABELS = (HIGHEST_REGION_LABEL, LOWEST_REGION_LABEL, TOP_PRODUCT_LABEL, BOTTOM_PRODUCT_LABEL)
+
+
+class ScenarioEngine:
+    """Evaluate many scenarios against one dataset"""
+
+    def __init__(self, sales_data):
+        matrix = SalesMatrix.from_sales_data(sales_data)
+        self.regions = matrix.regions
+        self.products = matrix.products
+        self._values = matrix.values
+        self._region_index = {region: i for i, region in enumerate(self.regions)}
+        self._product_index = {product: i for i, product in enumerate(self.products)}
+        region_totals = matrix.row_totals()
+        product_totals = matrix.column_totals()
+        self._row_totals = [region_totals[region] for region in self.regions]
+        self._column_totals = [product_totals[product] for product in self.products]
+        self.baseline = ScenarioResult("baseline", label_regions(region_totals), label_products(product_totals))
+
+    def _changes(self, scenario):
+        """Multipliers other than 1 as {region index: m} and {product index: w}"""
+        m = {}
+        w = {}
+        for region, multiplier in scenario.regions.items():
+            if region not in self._region_index:
+                raise KeyError(f"Unknown region in scenario {scenario.name!r}: {region!r}")
+            if multiplier != 1:
+                m[self._region_index[region]] = multiplier
+        for product, multiplier in scenario.products.items():
+            if product not in self._product_index:
+                raise KeyError(f"Unknown product in scenario {scenario.name!r}: {product!r}")
+            if multiplier != 1:
+                w[self._product_index[product]] = multiplier
+        return m, w
+
+    def evaluate(self, scenarios):
+        """Return one ScenarioResult per scenario, in order"""
+        values = self._values
+        width = len(self.products)
+        results = []
+        for scenario in scenarios:
+            m, w = self._changes(scenario)
+            region_totals = {}
+            for r, region in enumerate(self.regions):
+                total = self._row_totals[r]
+                if w:
+                    base = r * width
+                    total += sum((multiplier - 1) * values[base + p] for p, multiplier in w.items())
+                if r in m:
+                    total *= m[r]
+                region_totals[region] = total
+            product_totals = {}
+            for p, product in enumerate(self.products):
+                total = self._column_totals[p]
+                if m:
+                    total += sum((multiplier - 1) * values[r * width + p] for r, multiplier in m.items())
+                if p in w:
+                    total *= w[p]
+                product_totals[product] = total
+            results.append(ScenarioResult(scenario.name, label_regions(region_totals),
+                                          label_products(product_totals)))
+        return results
+
+    def label_shifts(self, results):
+        """
+        Which labels move away from the baseline in each scenario
+        Return: {scenario name: {label: (baseline holder, scenario holder)}}
+        """
+        shifts = {}
+        for result in results:
+            moved = {}
+            for label in LABELS:
+                before, after = self.baseline.labelled(label), result.labelled(label)
+                if before != after:
+                    moved[label] = (before, after)
+            shifts[result.name] = moved
+        return shifts
@@ -0,0 +1,183 @@
+"""
+Publish sales_data once in shared memory for zero-copy multi-process analyses.
+
+Block layout (little endian):
+    header  : magic, label table length, region count, product count
+    labels  : JSON {"regions": [...], "products": [...], "tracker": pid}
+              padded to 8 bytes; tracker is the publisher's resource
+              tracker process, if any
+    values  : float64[regions * products]
+    kinds   : int8[regions * products]   (see sales_matrix)
+
+Workers receive only the block name and a row range, attach, aggregate
+directly on the shared buffers and detach.
+"""
+
+import json
+import struct
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from aggregation import label_products, label_regions
+from sales_matrix import SalesMatrix
+
+MAGIC = b"SLS1"
+HEADER = struct.Struct("<4sIQQ")
+
+
+def _padded(size):
+    return (size + 7) // 8 * 8
+
+
+def _tracker_pid():
+    """Pid of this process's resource tracker, starting it if needed"""
+    try:
+        resource_tracker.ensure_running()
+    except Exception:
+        return None
+    return getattr(resource_tracker._resource_tracker, "_pid", None)
+
+
+def _release(shm, views, unlink):
+    for view in views:
+        view.release()
+    shm.close()
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedSalesDataset:
+    """
+    A SalesMatrix backed by a shared memory block
+
+    Use publish() in the owning process and attach() in workers. The owner
+    unlinks the block on close(), on context exit, or at interpreter exit.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf
+        magic, labels_len, n_regions, n_products = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory block {shm.name!r} is not a sales dataset")
+        labels_start = HEADER.size
+        labels = json.loads(bytes(buf[labels_start:labels_start + labels_len]).decode("utf-8"))
+        self.publisher_tracker = labels.get("tracker")
+        cells = n_regions * n_products
+        values_start = labels_start + _padded(labels_len)
+        kinds_start = values_start + 8 * cells
+        self._views = [buf[values_start:kinds_start].cast("d"), buf[kinds_start:kinds_start + cells].cast("b")]
+        self.matrix = SalesMatrix(labels["regions"], labels["products"], *self._views)
+        self._finalizer = weakref.finalize(self, _release, shm, self._views, owner)
+
+    @classmethod
+    def publish(cls, sales_data):
+        """Copy sales_data into a new shared memory block"""
+        source = SalesMatrix.from_sales_data(sales_data)
+        labels = json.dumps({"regions": source.regions, "products": source.products,
+                             "tracker": _tracker_pid()}).encode("utf-8")
+        cells = len(source.values)
+        values_start = HEADER.size + _padded(len(labels))
+        size = values_start + 9 * cells
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            buf = shm.buf
+            HEADER.pack_into(buf, 0, MAGIC, len(labels), len(source.regions), len(source.products))
+            buf[HEADER.size:HEADER.size + len(labels)] = labels
+            buf[values_start:values_start + 8 * cells] = source.values.tobytes()
+            buf[values_start + 8 * cells:size] = source.kinds.tobytes()
+            return cls(shm, owner=True)
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block published by another process"""
+        try:
+            # Python 3.13+: never let an attaching process clean the block up
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = None
+        if shm is not None:
+            return cls(shm, owner=False)
+
+        # Older versions always register the block with this process's
+        # resource tracker, which would unlink it when this process exits.
+        # Undo that unless the tracker is the publisher's own (same process
+        # or forked pool workers), where the registration is already held
+        # and unregistering would drop the publisher's.
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            dataset = cls(shm, owner=False)
+        except BaseException:
+            resource_tracker.unregister(shm._name, "shared_memory")
+            shm.close()
+            raise
+        if dataset.publisher_tracker is None or dataset.publisher_tracker != _tracker_pid():
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return dataset
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        """Detach; the owner also unlinks the block"""
+        self.matrix = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales"""
+        return self.matrix.regional_results()
+
+    def product_results(self):
+        """Same shape as analyze_product_performance"""
+        return self.matrix.product_results()
+
+
+def _aggregate_rows(name, start, stop):
+    """Worker: attach by name and total a range of rows"""
+    with SharedSalesDataset.attach(name) as dataset:
+        matrix = dataset.matrix
+        return matrix.row_totals(start, stop), matrix.column_totals(start, stop)
+
+
+def parallel_analyze(dataset, workers=4, executor=None):
+    """
+    Run both analyses across a process pool on a published dataset
+    Return: (regional_results, product_results)
+    """
+    n_regions = len(dataset.matrix.regions)
+    step = max(1, -(-n_regions // workers))
+    ranges = [(start, min(start + step, n_regions)) for start in range(0, n_regions, step)]
+
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(_aggregate_rows, dataset.name, start, stop) for start, stop in ranges]
+        region_totals = {}
+        product_totals = {}
+        for future in futures:
+            regions, products = future.result()
+            region_totals.update(regions)
+            for product, total in products.items():
+                product_totals[product] = product_totals.get(product, 0) + total
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    ordered_products = {product: product_totals[product]
+                        for product in dataset.matrix.products if product in product_totals}
+    return label_regions(region_totals), label_products(ordered_products)
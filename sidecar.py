@@ -0,0 +1,173 @@
+"""
+Materialized aggregate sidecar files.
+
+Next to each sales export, <export>.totals.json stores the regional and
+product results together with the SHA-256 checksum of the export it was
+built from. Loading a valid sidecar means hashing the export and reading a
+small JSON file instead of parsing and aggregating every cell. The export is
+read once: the checksum and, when needed, the parse both use the same bytes,
+so a sidecar always describes exactly the contents it was hashed from. When the
+export changes, the checksum no longer matches and the sidecar is ignored.
+The fresh results are then computed once and the sidecar is rewritten on a
+background thread. SidecarRebuilder keeps the sidecars of a set of exports
+current between sessions.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+
+from aggregation import SalesTotals
+from sales_file import parse_sales_lines
+
+SIDECAR_SUFFIX = ".totals.json"
+SIDECAR_FORMAT = 1
+
+
+def sidecar_path(path):
+    return path + SIDECAR_SUFFIX
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_export(path):
+    """Return (contents, SHA-256 hex digest) of an export from a single read"""
+    with open(path, "rb") as file:
+        data = file.read()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def compute_results(path, data=None):
+    """
+    Parse and aggregate an export; return (regional, products)
+    data is the export's contents when they have already been read
+    """
+    if data is None:
+        data, _ = read_export(path)
+    sales_data = {}
+    with io.TextIOWrapper(io.BytesIO(data), newline="") as file:
+        for region, product, amount in parse_sales_lines(file):
+            sales_data.setdefault(region, {})[product] = amount
+    totals = SalesTotals(sales_data)
+    return totals.regional_results(), totals.product_results()
+
+
+def write_sidecar(path, checksum, regional, products):
+    """Atomically replace the sidecar of an export"""
+    document = {
+        "format": SIDECAR_FORMAT,
+        "checksum": checksum,
+        "regional": [[region, total, label] for region, (total, label) in regional.items()],
+        "products": [[product, total, label] for product, (total, label) in products.items()],
+    }
+    target = sidecar_path(path)
+    temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(document, file, separators=(",", ":"))
+    os.replace(temporary, target)
+
+
+def read_sidecar(path, checksum):
+    """Return (regional, products) if the sidecar matches checksum, else None"""
+    try:
+        with open(sidecar_path(path), "r", encoding="utf-8") as file:
+            document = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(document, dict):
+        return None
+    if document.get("format") != SIDECAR_FORMAT or document.get("checksum") != checksum:
+        return None
+    try:
+        regional = {region: (total, label) for region, total, label in document["regional"]}
+        products = {product: (total, label) for product, total, label in document["products"]}
+    except (TypeError, KeyError, ValueError):
+        return None
+    return regional, products
+
+
+def rebuild_sidecar(path):
+    """Rebuild the sidecar if it is missing or stale; return True if rewritten"""
+    data, checksum = read_export(path)
+    if read_sidecar(path, checksum) is not None:
+        return False
+    write_sidecar(path, checksum, *compute_results(path, data))
+    return True
+
+
+def load_results(path, background=True):
+    """
+    Regional and product results for an export, using its sidecar when valid
+    A stale or missing sidecar is rewritten on a background thread (or inline
+    when background is False) after the results have been computed
+    Return: (regional, products)
+    """
+    data, checksum = read_export(path)
+    cached = read_sidecar(path, checksum)
+    if cached is not None:
+        return cached
+    regional, products = compute_results(path, data)
+    if background:
+        threading.Thread(target=write_sidecar, args=(path, checksum, regional, products),
+                         daemon=True).start()
+    else:
+        write_sidecar(path, checksum, regional, products)
+    return regional, products
+
+
+class SidecarRebuilder:
+    """Background thread that keeps the sidecars of some exports current"""
+
+    def __init__(self, paths, interval=60.0):
+        self.paths = list(paths)
+        self.interval = interval
+        self.rebuilt = 0
+        self.errors = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Rebuild every stale sidecar once; return how many were rewritten"""
+        count = 0
+        for path in self.paths:
+            try:
+                if rebuild_sidecar(path):
+                    count += 1
+                self.errors.pop(path, None)
+            except Exception as e:
+                self.errors[path] = e
+        self.rebuilt += count
+        return count
+
+    def _run(self):
+        while True:
+            self.check()
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,92 @@
+"""
+Snapshot-isolated analysis engine for multi-threaded services.
+
+A single writer path applies sales updates to private totals and then
+publishes an immutable, versioned Snapshot with one reference assignment.
+Readers only ever dereference the current snapshot, so they never take a
+lock, never block writers and never observe a half-applied update. Given a
+MetricsRegistry, the engine records whether each analysis read was served
+from the snapshot's cached results.
+"""
+
+import threading
+from types import MappingProxyType
+
+from aggregation import SalesTotals, label_products, label_regions, validate_amount
+
+
+class Snapshot:
+    """Read-only view of the totals at one version"""
+
+    __slots__ = ("version", "region_totals", "product_totals", "_regional", "_products")
+
+    def __init__(self, version, region_totals, product_totals):
+        self.version = version
+        self.region_totals = MappingProxyType(dict(region_totals))
+        self.product_totals = MappingProxyType(dict(product_totals))
+        self._regional = None
+        self._products = None
+
+    def regional_results(self):
+        """Same shape as analyze_regional_sales; computed once per snapshot"""
+        if self._regional is None:
+            self._regional = MappingProxyType(label_regions(self.region_totals))
+        return self._regional
+
+    def product_results(self):
+        """Same shape as analyze_product_performance; computed once per snapshot"""
+        if self._products is None:
+            self._products = MappingProxyType(label_products(self.product_totals))
+        return self._products
+
+
+class SnapshotEngine:
+    """Publish versioned snapshots of regional and product totals"""
+
+    def __init__(self, sales_data=None, registry=None):
+        self.registry = registry
+        self._write_lock = threading.Lock()
+        self._totals = SalesTotals(sales_data)
+        self._snapshot = Snapshot(0, self._totals.region_totals, self._totals.product_totals)
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def snapshot(self):
+        """Return the latest published snapshot; never blocks"""
+        return self._snapshot
+
+    def apply(self, updates):
+        """
+        Apply (region, product, amount) updates as one atomic version
+        Return: the newly published Snapshot
+        """
+        updates = list(updates)
+        for region, product, amount in updates:
+            validate_amount(amount)
+        with self._write_lock:
+            for region, product, amount in updates:
+                self._totals.set_amount(region, product, amount)
+            snapshot = Snapshot(self._snapshot.version + 1,
+                                self._totals.region_totals, self._totals.product_totals)
+            self._snapshot = snapshot
+        return snapshot
+
+    def set_amount(self, region, product, amount):
+        """Apply a single cell update"""
+        return self.apply([(region, product, amount)])
+
+    def analyze_regional_sales(self):
+        """Regional results from the latest snapshot"""
+        snapshot = self._snapshot
+        if self.registry is not None:
+            self.registry.record_cache("analyze_regional_sales", snapshot._regional is not None)
+        return snapshot.regional_results()
+
+    def analyze_product_performance(self):
+        """Product results from the latest snapshot"""
+        snapshot = self._snapshot
+        if self.registry is not None:
+            self.registry.record_cache("analyze_product_performance", snapshot._products is not None)
+        return snapshot.product_results()
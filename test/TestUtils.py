@@ -1,19 +1,55 @@
 from test.TestResults import TestResults
 from test.TestCaseResultDto import TestCaseResultDto
+import atexit
+import glob
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import os
 
 class TestUtils:
     GUID = "dc66f3c1-630f-40ab-8314-f7bb9ffcb71f"
     # URL = "https://yaksha-prod-sbfn.azurewebsites.net/api/YakshaMFAEnqueue?code=jSTWTxtQ8kZgQ5FC0oLgoSgZG7UoU9Asnmxgp6hLLvYId/GW9ccoLw=="
     URL = "https://compiler.techademy.com/v1/mfa-results/push"
+    CUSTOM_DATA_PATH = "../custom.ih"
+
+    # Reporting modes (YAKSHA_REPORT_MODE):
+    #   immediate - post every assertion as it happens (default)
+    #   batch     - spool to disk and send the results at exit
+    #   offline   - spool to disk only; call flushResults() later to send
+    # Spooled results go to YAKSHA_BATCH_URL as one JSON array when it is
+    # set; otherwise each payload is posted to URL as in immediate mode.
+    # Each process spools to its own SPOOL_PATH.<pid> file, so several suites
+    # can share a workspace; the batch-mode exit flush only sends its own.
+    REPORT_MODE = os.environ.get('YAKSHA_REPORT_MODE', 'immediate')
+    SPOOL_PATH = os.environ.get('YAKSHA_SPOOL_PATH', '../yaksha_results.spool')
+    BATCH_URL = os.environ.get('YAKSHA_BATCH_URL')
+
+    _customData = None
+    _session = None
+    _flushRegistered = False
 
     @classmethod
-    def yakshaAssert(self, test_name, result, test_type):
-        ref = open("../custom.ih", "r")
-        customData = ref.read()
-        ref.close()
+    def readCustomData(self):
+        """Read custom.ih once per run"""
+        if self._customData is None:
+            with open(self.CUSTOM_DATA_PATH, "r") as ref:
+                self._customData = ref.read()
+        return self._customData
+
+    @classmethod
+    def getSession(self):
+        """Pooled HTTP session reused by every request of the run"""
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    @classmethod
+    def buildPayload(self, test_name, result, test_type):
+        customData = self.readCustomData()
         test_case_results = dict()
 
         result_status = "Failed"
@@ -28,11 +64,96 @@ class TestUtils:
         hostName = os.environ.get('HOSTNAME')
         attemptId = os.environ.get('ATTEMPT_ID')
 
-        test_results = TestResults(json.dumps(test_case_results), customData, hostName, attemptId)
+        return TestResults(json.dumps(test_case_results), customData, hostName, attemptId)
+
+    @classmethod
+    def yakshaAssert(self, test_name, result, test_type):
+        test_results = self.buildPayload(test_name, result, test_type)
+
+        if self.REPORT_MODE in ("batch", "offline"):
+            self.spoolResult(test_results)
+            return
 
         final_result = json.dumps(test_results)
 
-        response = requests.post(self.URL, final_result, headers={"Content-Type": "application/json"})
+        response = self.getSession().post(self.URL, final_result, headers={"Content-Type": "application/json"})
         if response.status_code not in [200, 201]:
-            length = len(customData)
-            print(f'⚠️ Unable to push test cases from {hostName}, please try again![{length}]')
+            length = len(test_results["customData"])
+            print(f'⚠️ Unable to push test cases from {test_results["hostName"]}, please try again![{length}]')
+
+    @classmethod
+    def spoolFile(self, pid=None):
+        """Spool file of one process (this one by default)"""
+        return f"{self.SPOOL_PATH}.{os.getpid() if pid is None else pid}"
+
+    @classmethod
+    def spoolFiles(self):
+        """Every process's spool file under SPOOL_PATH"""
+        prefix = self.SPOOL_PATH + "."
+        return sorted(path for path in glob.glob(glob.escape(self.SPOOL_PATH) + ".*")
+                      if path[len(prefix):].isdigit())
+
+    @classmethod
+    def spoolResult(self, test_results):
+        """Append one result to this process's spool file"""
+        with open(self.spoolFile(), "a", encoding="utf-8") as spool:
+            spool.write(json.dumps(test_results) + "\n")
+        if self.REPORT_MODE == "batch" and not self._flushRegistered:
+            atexit.register(self.flushResults, True)
+            self._flushRegistered = True
+
+    @classmethod
+    def postJson(self, url, body):
+        """POST a JSON body; True when the endpoint accepted it"""
+        try:
+            response = self.getSession().post(url, json.dumps(body), headers={"Content-Type": "application/json"})
+        except requests.RequestException:
+            return False
+        return response.status_code in [200, 201]
+
+    @classmethod
+    def flushResults(self, ownOnly=False):
+        """
+        Send spooled results: one request to BATCH_URL if configured,
+        otherwise one request per result to URL over the pooled session
+        Each spool file is claimed by renaming it first, so concurrent
+        flushes never send the same results twice. ownOnly limits the flush
+        to this process's spool; otherwise every process's spool is sent,
+        so call it once the suites writing them have finished.
+        Results that could not be pushed are kept in this process's spool
+        Return: number of results pushed
+        """
+        candidates = [self.spoolFile()] if ownOnly else self.spoolFiles()
+        claimed = []
+        for path in candidates:
+            target = f"{path}.claimed-{os.getpid()}"
+            try:
+                os.rename(path, target)
+            except FileNotFoundError:
+                continue
+            claimed.append(target)
+
+        batch = []
+        for path in claimed:
+            with open(path, "r", encoding="utf-8") as spool:
+                batch.extend(json.loads(line) for line in spool if line.strip())
+
+        if not batch:
+            pushed = 0
+        elif self.BATCH_URL:
+            pushed = len(batch) if self.postJson(self.BATCH_URL, batch) else 0
+        else:
+            pushed = 0
+            for test_results in batch:
+                if not self.postJson(self.URL, test_results):
+                    break
+                pushed += 1
+
+        if pushed < len(batch):
+            with open(self.spoolFile(), "a", encoding="utf-8") as spool:
+                for test_results in batch[pushed:]:
+                    spool.write(json.dumps(test_results) + "\n")
+            print(f'⚠️ Unable to push {len(batch) - pushed} spooled test cases, results kept in {self.spoolFile()}')
+        for path in claimed:
+            os.remove(path)
+        return pushed
@@ -0,0 +1,68 @@
+import random
+import statistics
+import unittest
+
+from anomaly import RunningMoments, StreamingAnomalyDetector, detect_anomalies
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestAnomalyDetection(unittest.TestCase):
+    def test_flags_south_product_c(self):
+        """Product C in South is the outlier of its column"""
+        anomalies = detect_anomalies(sales_data)
+        flagged = {(anomaly.region, anomaly.product) for anomaly in anomalies}
+        self.assertIn(("South", "Product C"), flagged)
+        south_c = next(a for a in anomalies if (a.region, a.product) == ("South", "Product C"))
+        self.assertLess(south_c.score, 0)
+
+    def test_mad_method(self):
+        """Median/MAD scores flag the same cell"""
+        anomalies = detect_anomalies(sales_data, threshold=1.6, method="mad")
+        self.assertEqual([(a.region, a.product) for a in anomalies], [("South", "Product C")])
+        with self.assertRaises(ValueError):
+            detect_anomalies(sales_data, method="iqr")
+
+    def test_missing_cells_are_excluded(self):
+        """Regions without a product do not drag its mean to zero"""
+        data = {"R1": {"P": 10}, "R2": {"P": 10}, "R3": {}}
+        self.assertEqual(detect_anomalies(data, threshold=0.1), [])
+
+    def test_merged_moments_match_whole(self):
+        """Chunked moments merge to the single-pass statistics"""
+        rng = random.Random(4)
+        values = [rng.uniform(0, 100) for _ in range(1000)]
+        merged = RunningMoments()
+        for start in range(0, 1000, 137):
+            merged.merge(RunningMoments.of(values[start:start + 137]))
+        self.assertEqual(merged.count, 1000)
+        self.assertAlmostEqual(merged.mean, statistics.fmean(values))
+        self.assertAlmostEqual(merged.std, statistics.pstdev(values))
+
+    def test_streaming_detector(self):
+        """Chunks of regions give the same scores as the whole dataset"""
+        detector = StreamingAnomalyDetector()
+        detector.update({"North": sales_data["North"], "South": sales_data["South"]})
+        detector.update({"East": sales_data["East"], "West": sales_data["West"]})
+        streamed = detector.anomalies(sales_data)
+        whole = detect_anomalies(sales_data)
+        self.assertEqual([(a.region, a.product) for a in streamed], [(a.region, a.product) for a in whole])
+        for a, b in zip(streamed, whole):
+            self.assertAlmostEqual(a.score, b.score)
+
+    def test_streaming_unseen_product_scores_zero(self):
+        """Cells of products not yet folded in are skipped rather than raising"""
+        detector = StreamingAnomalyDetector().update(sales_data)
+        chunk = {"Central": {"Product A": 500, "Product Z": 10 ** 6}}
+        self.assertEqual(detector.score("Central", "Product Z", 10 ** 6), 0.0)
+        flagged = [(a.region, a.product) for a in detector.anomalies(chunk)]
+        self.assertEqual(flagged, [("Central", "Product A")])
+
+
+if __name__ == '__main__':
+    unittest.main()
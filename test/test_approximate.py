@@ -0,0 +1,97 @@
+import random
+import unittest
+
+from aggregation import SalesTotals
+from approximate import ApproximateAnalysis
+
+
+def make_sales_data(regions, products, seed=0):
+    rng = random.Random(seed)
+    return {
+        f"Region{r}": {f"Product{p}": rng.randint(0, 100) + 10 * r for p in range(products)}
+        for r in range(regions)
+    }
+
+
+class TestApproximateAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.data = make_sales_data(6, 400)
+        self.exact = SalesTotals(self.data)
+
+    def test_intervals_cover_exact_totals(self):
+        """Most 95% intervals contain the true region totals"""
+        result = ApproximateAnalysis(self.data, fraction=0.2, seed=1).estimate()
+        covered = sum(low <= self.exact.region_totals[region] <= high
+                      for region, (low, high) in result.regional_intervals.items())
+        self.assertGreaterEqual(covered, 5)
+        self.assertFalse(result.exact)
+        self.assertAlmostEqual(result.sampled_fraction, 0.2)
+
+    def test_label_probabilities_reported(self):
+        """Every assigned label comes with a probability"""
+        result = ApproximateAnalysis(self.data, fraction=0.1, draws=200, seed=2).estimate()
+        for label in ("Highest performing region", "Lowest performing region", "Top product", "Bottom product"):
+            self.assertGreaterEqual(result.label_probability[label], 0)
+            self.assertLessEqual(result.label_probability[label], 1)
+        self.assertGreater(result.label_probability["Highest performing region"], 0.9)
+
+    def test_unsampled_products_reported(self):
+        """Products not drawn yet still get an estimate and a non-zero interval"""
+        data = make_sales_data(5, 200, seed=4)
+        analysis = ApproximateAnalysis(data, fraction=0.05, draws=100, seed=5)
+        result = analysis.estimate()
+        self.assertEqual(set(result.products), set(SalesTotals(data).product_totals))
+        self.assertEqual(set(result.product_intervals), set(result.products))
+        sampled = {product for stratum in analysis.strata.values() for product in stratum.product_amounts}
+        unsampled = [product for product in result.products if product not in sampled]
+        self.assertTrue(unsampled)
+        for product in unsampled:
+            low, high = result.product_intervals[product]
+            self.assertGreater(result.products[product][0], 0)
+            self.assertGreater(high - low, 0)
+
+    def test_product_estimates_follow_each_region_product_set(self):
+        """Unsampled cells add their own region's mean, only in regions that sell the product"""
+        data = make_sales_data(4, 60, seed=6)
+        del data["Region1"]["Product3"]
+        data["Region2"] = {product: amount for product, amount in data["Region2"].items()
+                           if product.endswith(("1", "2"))}
+        analysis = ApproximateAnalysis(data, fraction=0.1, draws=50, seed=7)
+        result = analysis.estimate()
+        for product, (total, _) in result.products.items():
+            expected = 0
+            for stratum in analysis.strata.values():
+                if product in stratum.product_amounts:
+                    expected += stratum.product_amounts[product]
+                elif product in stratum.products:
+                    expected += stratum.total / stratum.taken
+            self.assertAlmostEqual(total, expected)
+
+    def test_clear_leader_needs_no_draws(self):
+        """A leader whose interval overlaps no other candidate is certain"""
+        data = make_sales_data(4, 50, seed=8)
+        data["Region0"] = {product: amount * 100 for product, amount in data["Region0"].items()}
+        result = ApproximateAnalysis(data, fraction=0.5, seed=9).estimate()
+        self.assertEqual(result.label_probability["Highest performing region"], 1.0)
+
+    def test_progressive_refinement_reaches_exact(self):
+        """Refinement ends with the exact analysis results"""
+        analysis = ApproximateAnalysis(self.data, fraction=0.01, draws=50, seed=3)
+        widths = []
+        for result in analysis.progressive(factor=4):
+            low, high = result.regional_intervals["Region0"]
+            widths.append(high - low)
+        self.assertTrue(result.exact)
+        self.assertEqual(widths[-1], 0)
+        self.assertEqual(result.regional, self.exact.regional_results())
+        self.assertEqual(result.products, self.exact.product_results())
+        self.assertEqual(result.label_probability["Top product"], 1.0)
+
+    def test_none_input(self):
+        """Same validation as the exact analyses"""
+        with self.assertRaises(TypeError):
+            ApproximateAnalysis(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
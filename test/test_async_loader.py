@@ -0,0 +1,131 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aggregation import SalesTotals
+from async_loader import load_regions, load_sales_data_async, parse_region_source
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90.5},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+def region_text(products):
+    return "product,amount\n" + "".join(f"{product},{amount}\n" for product, amount in products.items())
+
+
+class ObjectStoreHandler(BaseHTTPRequestHandler):
+    """Local object-store emulator serving one object per region"""
+
+    def do_GET(self):
+        if self.path.startswith("/chunked/"):
+            self._send_chunked(self.server.objects[self.path[len("/chunked/"):]].encode("utf-8"))
+            return
+        body = self.server.objects.get(self.path.lstrip("/"))
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunked(self, data):
+        """Reply with Transfer-Encoding: chunked regardless of the request version"""
+        self.wfile.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        for start in range(0, len(data), 7):
+            piece = data[start:start + 7]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+        self.wfile.write(b"0\r\n\r\n")
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncLoader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ObjectStoreHandler)
+        self.server.objects = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+
+        self.sources = {}
+        for index, (region, products) in enumerate(sales_data.items()):
+            if index % 2:
+                self.server.objects[region] = region_text(products)
+                self.sources[region] = f"{base}/{region}"
+            else:
+                path = os.path.join(self.directory.name, f"{region}.csv")
+                with open(path, "w") as file:
+                    file.write(region_text(products))
+                self.sources[region] = path
+        self.base = base
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_loads_files_and_urls(self):
+        """Mixed file and HTTP sources produce the complete dataset"""
+        loaded = load_sales_data_async(self.sources, concurrency=2)
+        self.assertEqual(loaded, sales_data)
+        self.assertEqual(list(loaded), list(sales_data))
+
+    def test_folds_each_region_as_it_arrives(self):
+        """Totals are updated once per region and end up complete"""
+        seen = []
+        totals = asyncio.run(load_regions(self.sources, concurrency=1,
+                                          on_region=lambda region, totals: seen.append(region)))
+        self.assertEqual(sorted(seen), sorted(sales_data))
+        expected = SalesTotals(sales_data)
+        self.assertEqual(totals.regional_results(), expected.regional_results())
+        self.assertEqual(totals.product_results(), expected.product_results())
+
+    def test_chunked_response_is_decoded(self):
+        """Chunk-size lines never leak into the parsed body"""
+        region = next(region for region, source in self.sources.items() if source.startswith("http://"))
+        sources = dict(self.sources, **{region: f"{self.base}/chunked/{region}"})
+        self.assertEqual(load_sales_data_async(sources), sales_data)
+
+    def test_missing_source_fails(self):
+        """A failing source raises instead of returning partial data"""
+        sources = dict(self.sources, Central=f"{self.base}/Central")
+        with self.assertRaises(OSError):
+            load_sales_data_async(sources)
+
+    def test_unsupported_scheme_fails_before_fetching(self):
+        """Only http and https URLs are fetched; other schemes are rejected up front"""
+        sources = dict(self.sources, Central="ftp://127.0.0.1/Central")
+        with self.assertRaises(ValueError):
+            load_sales_data_async(sources)
+
+
+class TestParseRegionSource(unittest.TestCase):
+    def test_product_names_with_commas(self):
+        """The last field is the amount, whatever the first line looks like"""
+        text = 'Widget, large,5\nGadget,3\n"Quoted, name",2.5\n'
+        self.assertEqual(list(parse_region_source("North", text)),
+                         [("Widget, large", 5), ("Gadget", 3), ("Quoted, name", 2.5)])
+
+    def test_export_header_selects_export_format(self):
+        """An export source must only hold rows for its own region"""
+        text = "region,product,amount\nNorth,Widget,5\n"
+        self.assertEqual(list(parse_region_source("North", text)), [("Widget", 5)])
+        with self.assertRaises(ValueError):
+            list(parse_region_source("North", text + "South,Widget,4\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
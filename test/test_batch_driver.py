@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+from aggregation import SalesTotals
+from batch_driver import BatchDriver, BatchReport
+from sales_file import write_sales_file
+
+
+class TestBatchDriver(unittest.TestCase):
+    def setUp(self):
+        """Write one small export per store-day"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        self.combined = SalesTotals()
+        for day in range(12):
+            data = {
+                "North": {"Product A": 10 + day, "Product B": 5},
+                "South": {"Product A": 7, "Product C": day},
+            }
+            path = os.path.join(self.directory.name, f"store-{day}.csv")
+            write_sales_file(path, data)
+            self.paths.append(path)
+            for region, products in data.items():
+                for product, amount in products.items():
+                    previous = self.combined.cells.get(region, {}).get(product, 0)
+                    self.combined.set_amount(region, product, previous + amount)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_rollups_merge_every_file(self):
+        """Global rollups equal the sum over all files"""
+        with BatchDriver(workers=2, chunk_size=3) as driver:
+            report = driver.run(self.paths)
+            again = driver.run(self.paths[:2])
+        self.assertEqual(report.regional, self.combined.regional_results())
+        self.assertEqual(report.products, self.combined.product_results())
+        self.assertEqual(report.files, 12)
+        self.assertEqual(report.cells, 48)
+        self.assertGreater(report.files_per_second, 0)
+        self.assertEqual(again.files, 2)
+
+    def test_bad_file_does_not_abort_run(self):
+        """A malformed file is reported as a failure and the rest still merge"""
+        bad = os.path.join(self.directory.name, "broken.csv")
+        with open(bad, "w") as file:
+            file.write("N,A,abc\n")
+        missing = os.path.join(self.directory.name, "missing.csv")
+        with BatchDriver(workers=2, chunk_size=2) as driver:
+            report = driver.run(self.paths + [bad, missing])
+        self.assertEqual(report.regional, self.combined.regional_results())
+        self.assertEqual(report.files, 12)
+        self.assertEqual(sorted(report.failures), sorted([bad, missing]))
+        self.assertIn("TypeError", report.failures[bad])
+
+    def test_stragglers(self):
+        """Files far slower than the median are reported slowest first"""
+        timings = {"a": 0.01, "b": 0.011, "c": 0.012, "d": 0.2, "e": 0.05}
+        report = BatchReport({}, {}, timings, 0, 1.0)
+        self.assertEqual([path for path, _ in report.stragglers()], ["d", "e"])
+
+
+if __name__ == '__main__':
+    unittest.main()
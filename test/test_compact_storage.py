@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from aggregation import SalesTotals
+from compact_storage import CompactSalesData
+from sales_matrix import SalesMatrix
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "Region1": {"Product1": 0, "Product2": 9999999.99},
+    "Region2": {"Product1": 100.5, "Product2": 200.75},
+    "Big": {"Product A": 70000},
+    "EmptyRegion": {}
+}
+
+
+class TestCompactStorage(unittest.TestCase):
+    def setUp(self):
+        self.compact = CompactSalesData(sales_data)
+
+    def test_narrowest_typecodes(self):
+        """Each region gets the smallest exact representation"""
+        self.assertEqual(self.compact.typecodes(), {
+            "North": "h", "South": "h", "Region1": "d", "Region2": "f", "Big": "i", "EmptyRegion": "h"})
+
+    def test_results_match_nested_loops(self):
+        """Totals, types and labels match the dict-based aggregation"""
+        expected = SalesTotals(sales_data)
+        self.assertEqual(self.compact.regional_results(), expected.regional_results())
+        self.assertEqual(self.compact.product_results(), expected.product_results())
+        self.assertIsInstance(self.compact.region_totals()["North"], int)
+        self.assertEqual(self.compact.get("Region2", "Product1"), 100.5)
+        self.assertIsNone(self.compact.get("EmptyRegion", "Product1"))
+
+    def test_updates_upcast_blocks(self):
+        """Values that do not fit widen the block automatically"""
+        self.compact.set_amount("North", "Product A", 40000)
+        self.assertEqual(self.compact.typecodes()["North"], "i")
+        self.compact.set_amount("North", "Product B", 2 ** 40)
+        self.assertEqual(self.compact.typecodes()["North"], "q")
+        self.compact.set_amount("South", "Product C", 0.5)
+        self.assertEqual(self.compact.typecodes()["South"], "f")
+        self.compact.set_amount("South", "Product C", 0.1)
+        self.assertEqual(self.compact.typecodes()["South"], "d")
+        self.assertEqual(self.compact.get("South", "Product A"), 95)
+        self.assertIsInstance(self.compact.get("South", "Product A"), int)
+        self.compact.set_amount("EmptyRegion", "Product D", 7)
+        self.assertEqual(self.compact.get("EmptyRegion", "Product D"), 7)
+        self.assertIsNone(self.compact.get("EmptyRegion", "Product A"))
+        self.assertEqual(self.compact.region_totals()["North"], 40000 + 2 ** 40 + 45)
+        with self.assertRaises(ValueError):
+            self.compact.set_amount("North", "Product A", -1)
+
+    def test_large_int_beside_float_is_rejected(self):
+        """Loading refuses to round an int above 2**53 into a float block"""
+        with self.assertRaises(OverflowError):
+            CompactSalesData({"N": {"A": 2 ** 60 + 1, "B": 0.5}})
+        compact = CompactSalesData({"N": {"A": 2 ** 53, "B": 0.5}})
+        self.assertEqual(compact.get("N", "A"), 2 ** 53)
+        with self.assertRaises(OverflowError):
+            compact.set_amount("N", "C", 2 ** 60 + 1)
+
+    def test_halves_memory_for_unit_counts(self):
+        """Small integer counts take far less than a float64 matrix"""
+        rng = random.Random(2)
+        data = {f"Region{r}": {f"Product{p}": rng.randint(0, 500) for p in range(200)} for r in range(50)}
+        compact = CompactSalesData(data)
+        matrix = SalesMatrix.from_sales_data(data)
+        dense = matrix.values.itemsize * len(matrix.values)
+        self.assertLessEqual(compact.nbytes * 2, dense)
+        self.assertEqual(compact.product_results(), SalesTotals(data).product_results())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import random
+import statistics
+import unittest
+
+from correlation import correlated_products
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestCorrelation(unittest.TestCase):
+    def test_matches_pearson(self):
+        """Every pair agrees with statistics.correlation"""
+        pairs = correlated_products(sales_data, threshold=-1.0, absolute=False)
+        self.assertEqual(len(pairs), 3)
+        for product, other, r in pairs:
+            a = [sales_data[region][product] for region in sales_data]
+            b = [sales_data[region][other] for region in sales_data]
+            self.assertAlmostEqual(r, statistics.correlation(a, b))
+
+    def test_threshold_filters_pairs(self):
+        """Only strongly related pairs are returned"""
+        pairs = correlated_products(sales_data, threshold=0.9)
+        self.assertEqual([(p, q) for p, q, _ in pairs], [("Product A", "Product C")])
+
+    def test_blocks_give_same_pairs(self):
+        """Block size does not change the result"""
+        rng = random.Random(11)
+        data = {f"Region{r}": {f"Product{p}": rng.randint(0, 50) + (r * 10 if p % 3 == 0 else 0)
+                               for p in range(40)} for r in range(8)}
+        whole = correlated_products(data, threshold=0.5, block_size=1000)
+        blocked = correlated_products(data, threshold=0.5, block_size=7)
+        self.assertEqual(sorted(whole), sorted(blocked))
+        self.assertTrue(whole)
+
+    def test_constant_products_are_skipped(self):
+        """A product with identical sales everywhere has no correlation"""
+        data = {"R1": {"P": 5, "Q": 1}, "R2": {"P": 5, "Q": 2}}
+        self.assertEqual(correlated_products(data, threshold=0.0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import csv
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from export import PRODUCT_ANALYSIS, REGIONAL_ANALYSIS, export_csv, export_jsonl
+
+regional_results = {
+    "North": (250, ""),
+    "South": (235, "Lowest performing region"),
+    "West": (300, "Highest performing region")
+}
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv_export(self):
+        """CSV rows use the display_results column headers"""
+        self.assertEqual(export_csv(regional_results, self.path, REGIONAL_ANALYSIS), 3)
+        with open(self.path, newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["Region", "Total Sales", "Performance"])
+        self.assertEqual(rows[3], ["West", "300", "Highest performing region"])
+
+    def test_jsonl_export(self):
+        """Each result becomes one JSON object"""
+        export_jsonl(regional_results, self.path, REGIONAL_ANALYSIS)
+        with open(self.path) as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(rows[1], {"region": "South", "total_sales": 235,
+                                   "performance": "Lowest performing region"})
+
+    def test_generator_export_runs_in_constant_memory(self):
+        """A large product generator is never materialised"""
+        rows = 50000
+        results = ((f"Product {i}", (i, "")) for i in range(rows))
+        tracemalloc.start()
+        count = export_jsonl(results, self.path, PRODUCT_ANALYSIS)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(count, rows)
+        self.assertLess(peak, 4 * 1024 * 1024)
+
+    def test_unknown_analysis_type(self):
+        """Only the two display_results layouts are supported"""
+        with self.assertRaises(ValueError):
+            export_csv(regional_results, self.path, "Invalid Analysis Type")
+        with self.assertRaises(TypeError):
+            export_csv(None, self.path, REGIONAL_ANALYSIS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from fixed_point import (CentsAggregate, aggregate_sharded, analyze_product_performance_exact,
+                         analyze_regional_sales_exact, to_cents)
+
+
+class TestFixedPoint(unittest.TestCase):
+    def test_boundary_values(self):
+        """Zero and very large amounts come back unchanged"""
+        boundary_sales = {"Region1": {"Product1": 0, "Product2": 9999999.99}}
+        regional = analyze_regional_sales_exact(boundary_sales)
+        self.assertEqual(regional["Region1"][0], 9999999.99)
+        products = analyze_product_performance_exact(boundary_sales)
+        self.assertEqual(products["Product1"], (0, "Bottom product"))
+        self.assertIsInstance(products["Product1"][0], int)
+
+    def test_exact_where_float_sum_drifts(self):
+        """Cent totals are exact where naive float addition is not"""
+        data = {"Region1": {f"Product{i}": 0.1 for i in range(10)}}
+        total = 0
+        for amount in data["Region1"].values():
+            total += amount
+        self.assertNotEqual(total, 1.0)
+        self.assertEqual(analyze_regional_sales_exact(data)["Region1"][0], 1.0)
+
+    def test_float_rounding_noise_accepted(self):
+        """Float arithmetic results within rounding of a cent convert cleanly"""
+        self.assertEqual(to_cents(0.1 + 0.2), 30)
+        self.assertEqual(to_cents(9999999.99), 999999999)
+        data = {"Region1": {"Product1": 0.1 + 0.2, "Product2": 0.7}}
+        self.assertEqual(analyze_regional_sales_exact(data)["Region1"][0], 1.0)
+
+    def test_large_sub_cent_amounts_rejected(self):
+        """Rejection does not depend on the magnitude of the amount"""
+        for amount in (10.005, 12345.678, 1234567.891, 98765432.105):
+            with self.assertRaises(ValueError):
+                to_cents(amount)
+        self.assertEqual(to_cents(1234567.89), 123456789)
+
+    def test_sharding_is_reproducible(self):
+        """Any split of the regions gives bit-identical totals"""
+        rng = random.Random(9)
+        data = {f"Region{r}": {f"Product{p}": round(rng.uniform(0, 1000), 2) for p in range(50)}
+                for r in range(20)}
+        whole = CentsAggregate.from_sales_data(data)
+        regions = list(data.items())
+        for split in (1, 3, 7):
+            shards = [dict(regions[i:i + split]) for i in range(0, len(regions), split)]
+            merged = aggregate_sharded(reversed(shards))
+            self.assertEqual(merged.product_totals(), whole.product_totals())
+            self.assertEqual(merged.region_totals(), whole.region_totals())
+
+    def test_validation_and_overflow(self):
+        """Bad amounts and int64 overflow are reported"""
+        with self.assertRaises(TypeError):
+            analyze_regional_sales_exact({"Region1": {"Product1": "100"}})
+        with self.assertRaises(ValueError):
+            analyze_regional_sales_exact({"Region1": {"Product1": -100}})
+        with self.assertRaises(ValueError):
+            to_cents(1.005)
+        with self.assertRaises(OverflowError):
+            to_cents(2 ** 62)
+        with self.assertRaises(OverflowError):
+            analyze_regional_sales_exact({"Region1": {"A": 2 ** 56, "B": 2 ** 56}})
+
+
+if __name__ == '__main__':
+    unittest.main()
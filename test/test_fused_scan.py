@@ -0,0 +1,67 @@
+import unittest
+
+import fused_scan
+from aggregation import SalesTotals
+from anomaly import detect_anomalies
+from fused_scan import register_analysis, registered_analyses, run_analyses
+from pivot import analyze_pivot
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50},
+    "EmptyRegion": {}
+}
+
+
+class CountingDict(dict):
+    """sales_data that counts how often it is traversed"""
+    traversals = 0
+
+    def items(self):
+        CountingDict.traversals += 1
+        return super().items()
+
+
+class TestFusedScan(unittest.TestCase):
+    def test_regional_and_product_registered_first(self):
+        self.assertEqual(registered_analyses()[:2], ["regional", "product"])
+
+    def test_results_identical_to_separate_analyses(self):
+        """Every analysis matches its standalone implementation"""
+        results = run_analyses(sales_data)
+        expected = SalesTotals(sales_data)
+        self.assertEqual(results["regional"], expected.regional_results())
+        self.assertEqual(list(results["product"].items()), list(expected.product_results().items()))
+        pivot = analyze_pivot(sales_data)
+        self.assertEqual(results["pivot"].region_totals, pivot.region_totals)
+        self.assertEqual(results["pivot"].grand_total, pivot.grand_total)
+        fused = [(a.region, a.product) for a in results["anomaly"]]
+        self.assertEqual(fused, [(a.region, a.product) for a in detect_anomalies(sales_data)])
+
+    def test_single_traversal(self):
+        """All analyses share one walk over sales_data"""
+        CountingDict.traversals = 0
+        run_analyses(CountingDict(sales_data), ["regional", "product", "pivot", "anomaly"])
+        self.assertEqual(CountingDict.traversals, 1)
+
+    def test_custom_analysis(self):
+        """New analyses plug in by declaring accumulators"""
+        self.addCleanup(fused_scan._ANALYSES.pop, "grand_total", None)
+        register_analysis("grand_total", ("region_totals",), lambda state: sum(state["region_totals"].values()))
+        self.assertEqual(run_analyses(sales_data, ["grand_total"]), {"grand_total": 1020})
+        with self.assertRaises(ValueError):
+            register_analysis("bad", ("median",), lambda state: None)
+
+    def test_validation(self):
+        with self.assertRaises(TypeError):
+            run_analyses(None)
+        with self.assertRaises(TypeError):
+            run_analyses({"Region1": {"Product1": "100"}}, ["product"])
+        with self.assertRaises(KeyError):
+            run_analyses(sales_data, ["forecast"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import http.client
+import json
+import unittest
+
+from aggregation import SalesTotals
+from http_service import SalesService
+from snapshot_engine import SnapshotEngine
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestHttpService(unittest.TestCase):
+    def setUp(self):
+        self.engine = SnapshotEngine(sales_data)
+        self.service = SalesService(self.engine).start()
+        self.addCleanup(self.service.stop)
+        host, port = self.service.server.server_address[:2]
+        self.connection = http.client.HTTPConnection(host, port)
+        self.addCleanup(self.connection.close)
+
+    def get(self, path, etag=None):
+        self.connection.request("GET", path, headers={"If-None-Match": etag} if etag else {})
+        response = self.connection.getresponse()
+        return response, response.read()
+
+    def test_results_match_analyses(self):
+        """JSON bodies carry the analysis results in order"""
+        expected = SalesTotals(sales_data)
+        response, body = self.get("/regional")
+        self.assertEqual(response.status, 200)
+        rows = json.loads(body)["results"]
+        self.assertEqual({row["region"]: (row["total"], row["label"]) for row in rows},
+                         expected.regional_results())
+        _, body = self.get("/product")
+        rows = json.loads(body)["results"]
+        self.assertEqual([(row["product"], row["total"], row["label"]) for row in rows],
+                         [(p, t, l) for p, (t, l) in expected.product_results().items()])
+
+    def test_conditional_requests_and_keep_alive(self):
+        """Matching ETags give 304 on the same connection until the data changes"""
+        response, _ = self.get("/regional")
+        etag = response.getheader("ETag")
+        sock = self.connection.sock
+        response, body = self.get("/regional", etag)
+        self.assertEqual(response.status, 304)
+        self.assertEqual(body, b"")
+        self.assertIs(self.connection.sock, sock)
+
+        self.engine.set_amount("East", "Product C", 500)
+        response, body = self.get("/regional", etag)
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+        self.assertEqual(json.loads(body)["version"], 1)
+
+    def test_cached_per_version(self):
+        """A version is rendered once no matter how often it is polled"""
+        for _ in range(5):
+            self.get("/product")
+        self.assertEqual(self.service.cache.misses, 1)
+        self.assertEqual(self.service.cache.hits, 4)
+        response, _ = self.get("/forecast")
+        self.assertEqual(response.status, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from aggregation import SalesTotals
+from lazy_results import LazyProductResults, lazy_product_performance
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestLazyResults(unittest.TestCase):
+    def test_equals_eager_results(self):
+        """A fully iterated lazy mapping equals the eager dict"""
+        eager = SalesTotals(sales_data).product_results()
+        lazy = lazy_product_performance(sales_data)
+        self.assertEqual(lazy, eager)
+        self.assertEqual(eager, lazy)
+        self.assertEqual(dict(lazy), eager)
+        self.assertEqual(lazy["Product B"], (405, ""))
+
+    def test_ties_match_sorted_ranking(self):
+        """Ties are labelled like the sorted batch ranking"""
+        rng = random.Random(8)
+        for _ in range(200):
+            data = {f"R{r}": {f"P{p}": rng.randint(0, 3) for p in range(rng.randint(1, 5))}
+                    for r in range(rng.randint(1, 3))}
+            self.assertEqual(dict(LazyProductResults(data)), SalesTotals(data).product_results())
+
+    def test_reads_maintained_totals(self):
+        """A maintained source is looked up, not rescanned"""
+        totals = SalesTotals(sales_data)
+        lazy = LazyProductResults(totals)
+        self.assertEqual(lazy["Product A"], (450, "Top product"))
+        self.assertNotIn("Product Z", lazy)
+        self.assertEqual(len(lazy), 3)
+
+    def test_read_only_and_validation(self):
+        lazy = lazy_product_performance(sales_data)
+        with self.assertRaises(TypeError):
+            lazy["Product A"] = (1, "")
+        with self.assertRaises(TypeError):
+            lazy_product_performance(None)
+        with self.assertRaises(TypeError):
+            lazy_product_performance({"Region1": {"Product1": "100"}})
+
+
+if __name__ == '__main__':
+    unittest.main()
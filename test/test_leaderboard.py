@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from aggregation import label_products
+from leaderboard import ProductLeaderboard
+
+
+class TestProductLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.totals = {"Product A": 450, "Product B": 405, "Product C": 165}
+        self.board = ProductLeaderboard(self.totals, seed=1)
+
+    def test_results_match_batch_labels(self):
+        """The ranking matches the batch product analysis"""
+        self.assertEqual(self.board.results(), label_products(self.totals))
+        self.assertEqual(list(self.board.results()), list(label_products(self.totals)))
+
+    def test_rank_and_label_follow_updates(self):
+        """Rank queries reflect each new sale"""
+        self.assertEqual(self.board.rank("Product B"), 2)
+        self.board.add("Product B", 100)
+        self.assertEqual(self.board.rank("Product B"), 1)
+        self.assertEqual(self.board.label("Product B"), "Top product")
+        self.assertEqual(self.board.label("Product A"), "")
+        self.assertEqual(self.board.label("Product C"), "Bottom product")
+
+    def test_single_product_is_top(self):
+        """A lone product carries the top label only"""
+        board = ProductLeaderboard({"OnlyProduct": 42})
+        self.assertEqual(board.results(), {"OnlyProduct": (42, "Top product")})
+
+    def test_randomised_against_batch(self):
+        """Ranks, slices and ties agree with sorting after every update"""
+        rng = random.Random(3)
+        board = ProductLeaderboard(seed=5)
+        totals = {}
+        for step in range(3000):
+            product = f"Product {rng.randrange(300)}"
+            if totals and rng.random() < 0.05:
+                victim = rng.choice(list(totals))
+                del totals[victim]
+                board.remove(victim)
+                continue
+            total = rng.randrange(50)
+            totals[product] = total
+            board.update(product, total)
+            if step % 250 == 0:
+                expected = label_products(totals)
+                self.assertEqual(list(board.results().items()), list(expected.items()))
+                ordered = list(expected)
+                for rank in (1, max(1, len(ordered) // 2), len(ordered)):
+                    self.assertEqual(board.rank(ordered[rank - 1]), rank)
+                window = board.ranked(10, 20)
+                self.assertEqual([entry[1] for entry in window], ordered[9:20])
+
+
+if __name__ == '__main__':
+    unittest.main()
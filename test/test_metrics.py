@@ -0,0 +1,106 @@
+import os
+import tempfile
+import types
+import unittest
+
+from http_service import ResponseCache
+from metrics import MetricsRegistry, PrometheusFileExporter, instrument_module
+from snapshot_engine import SnapshotEngine
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85},
+    "South": {"Product A": 95}
+}
+
+
+def fake_module():
+    """Stand-in for skeleton with the three instrumented functions"""
+    def analyze_regional_sales(data):
+        if data is None:
+            raise TypeError("sales_data cannot be None")
+        return {}
+
+    def analyze_product_performance(data):
+        return {}
+
+    def display_results(results, analysis_type):
+        pass
+
+    return types.SimpleNamespace(analyze_regional_sales=analyze_regional_sales,
+                                 analyze_product_performance=analyze_product_performance,
+                                 display_results=display_results)
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.module = instrument_module(fake_module(), self.registry)
+
+    def test_calls_cells_and_errors(self):
+        """Each call is counted with the cells it processed"""
+        self.module.analyze_regional_sales(sales_data)
+        self.module.analyze_regional_sales(sales_data)
+        with self.assertRaises(TypeError):
+            self.module.analyze_regional_sales(None)
+        self.module.display_results({"North": (205, "")}, "Regional Sales Analysis")
+        snapshot = self.registry.snapshot()
+        self.assertEqual(snapshot["analyze_regional_sales"]["calls"], 3)
+        self.assertEqual(snapshot["analyze_regional_sales"]["errors"], 1)
+        self.assertEqual(snapshot["analyze_regional_sales"]["cells"], 6)
+        self.assertEqual(sum(snapshot["analyze_regional_sales"]["buckets"]), 3)
+        self.assertEqual(snapshot["display_results"]["cells"], 1)
+
+    def test_instrumenting_twice_is_a_no_op(self):
+        """Functions are wrapped only once"""
+        wrapped = self.module.analyze_product_performance
+        instrument_module(self.module, self.registry)
+        self.assertIs(self.module.analyze_product_performance, wrapped)
+
+    def test_prometheus_text(self):
+        """Rendered output follows the exposition format"""
+        self.module.analyze_product_performance(sales_data)
+        self.registry.record_cache("analyze_product_performance", True)
+        self.registry.record_cache("analyze_product_performance", False)
+        text = self.registry.render()
+        self.assertIn("# TYPE sales_analysis_latency_seconds histogram", text)
+        self.assertIn('sales_analysis_calls_total{analysis="analyze_product_performance"} 1', text)
+        self.assertIn('sales_analysis_latency_seconds_bucket{analysis="analyze_product_performance",le="+Inf"} 1',
+                      text)
+        self.assertIn('sales_analysis_cache_hit_ratio{analysis="analyze_product_performance"} 0.5', text)
+
+    def test_snapshot_cache_hits(self):
+        """Engine reads report hits once a snapshot's results are cached"""
+        engine = SnapshotEngine(sales_data, registry=self.registry)
+        engine.analyze_regional_sales()
+        engine.analyze_regional_sales()
+        engine.set_amount("South", "Product B", 10)
+        engine.analyze_regional_sales()
+        engine.analyze_product_performance()
+        snapshot = self.registry.snapshot()
+        self.assertEqual((snapshot["analyze_regional_sales"]["cache_hits"],
+                          snapshot["analyze_regional_sales"]["cache_misses"]), (1, 2))
+        self.assertEqual(snapshot["analyze_product_performance"]["cache_misses"], 1)
+        self.assertIn('sales_analysis_cache_hit_ratio{analysis="analyze_regional_sales"} 0.333', self.registry.render())
+
+    def test_response_cache_hits(self):
+        """HTTP response cache lookups are reported per endpoint"""
+        cache = ResponseCache(SnapshotEngine(sales_data), registry=self.registry)
+        for _ in range(4):
+            cache.get("product")
+        snapshot = self.registry.snapshot()["http_product"]
+        self.assertEqual((snapshot["cache_hits"], snapshot["cache_misses"]), (3, 1))
+
+    def test_file_exporter(self):
+        """The exporter leaves a complete .prom file behind"""
+        self.module.analyze_regional_sales(sales_data)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sales.prom")
+            exporter = PrometheusFileExporter(self.registry, path, interval=0.01).start()
+            exporter.stop()
+            with open(path) as file:
+                self.assertEqual(file.read(), self.registry.render())
+            self.assertEqual(os.listdir(directory), ["sales.prom"])
+
+
+if __name__ == '__main__':
+    unittest.main()
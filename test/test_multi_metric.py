@@ -0,0 +1,49 @@
+import unittest
+
+from multi_metric import MultiMetricSales
+
+sales_data = {
+    "North": {"Product A": (10, 1200.0, 800.0), "Product B": (5, 400.0, 100.0)},
+    "South": {"Product A": (8, 900.0, 700.0), "Product C": (2, 300.0, 50.0)},
+    "East": {"Product B": (12, 1000.0, 900.0)},
+    "EmptyRegion": {}
+}
+
+
+class TestMultiMetric(unittest.TestCase):
+    def test_totals_for_every_metric(self):
+        """One pass yields every metric per region and per product"""
+        totals = MultiMetricSales.from_sales_data(sales_data).totals()
+        self.assertEqual(totals.regions["North"], {"units": 15, "revenue": 1600.0, "cost": 900.0})
+        self.assertEqual(totals.regions["EmptyRegion"], {"units": 0, "revenue": 0.0, "cost": 0.0})
+        self.assertEqual(totals.products["Product B"], {"units": 17, "revenue": 1400.0, "cost": 1000.0})
+        self.assertEqual(totals.product_values("margin"),
+                         {"Product A": 600.0, "Product B": 400.0, "Product C": 250.0})
+
+    def test_rank_by_metric(self):
+        """Labels follow whichever metric is chosen"""
+        dataset = MultiMetricSales.from_sales_data(sales_data)
+        self.assertEqual(list(dataset.product_results("units")), ["Product A", "Product B", "Product C"])
+        self.assertEqual(dataset.product_results("margin_percent")["Product C"][1], "Top product")
+        regional = dataset.regional_results("margin")
+        self.assertEqual(regional["North"], (700.0, "Highest performing region"))
+        self.assertEqual(regional["EmptyRegion"], (0.0, "Lowest performing region"))
+        with self.assertRaises(KeyError):
+            dataset.product_results("profit")
+
+    def test_validation_and_cache(self):
+        dataset = MultiMetricSales.from_sales_data(sales_data)
+        first = dataset.totals()
+        self.assertIs(dataset.totals(), first)
+        dataset.add("West", "Product A", 1, 10.0, 5.0)
+        self.assertEqual(dataset.totals().regions["West"]["units"], 1)
+        with self.assertRaises(TypeError):
+            dataset.add("West", "Product A", 1.5, 10.0, 5.0)
+        with self.assertRaises(ValueError):
+            dataset.add("West", "Product A", 1, -10.0, 5.0)
+        with self.assertRaises(TypeError):
+            MultiMetricSales.from_sales_data(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from period_diff import diff_sales
+
+last_week = {
+    "Region1": {"Product1": 100, "Product2": 200},
+    "Region2": {"Product1": 150}
+}
+
+this_week = {
+    "Region1": {"Product1": 120, "Product3": 40},
+    "Region2": {"Product1": 90},
+    "Region3": {"Product2": 10}
+}
+
+
+class TestPeriodDiff(unittest.TestCase):
+    def setUp(self):
+        self.diff = diff_sales(last_week, this_week)
+
+    def test_region_changes(self):
+        """Regions are aligned and new regions are marked added"""
+        self.assertEqual(self.diff.regions["Region1"].change, -140)
+        self.assertAlmostEqual(self.diff.regions["Region1"].percent, -46.666, places=2)
+        self.assertEqual(self.diff.regions["Region3"].status, "added")
+        self.assertIsNone(self.diff.regions["Region3"].percent)
+
+    def test_products_in_one_snapshot(self):
+        """Products from only one side are added or carried as changes"""
+        self.assertEqual(self.diff.products["Product1"].change, -40)
+        self.assertEqual(self.diff.products["Product2"].previous, 200)
+        self.assertEqual(self.diff.products["Product2"].current, 10)
+        self.assertEqual(self.diff.products["Product3"].status, "added")
+
+    def test_removed_products(self):
+        """A product missing from the current snapshot is removed"""
+        diff = diff_sales(this_week, last_week)
+        self.assertEqual(diff.products["Product3"].status, "removed")
+        self.assertEqual(diff.products["Product3"].change, -40)
+
+    def test_cell_changes(self):
+        """Cell-level changes come from the same pass as the totals"""
+        self.assertEqual(self.diff.cells[("Region2", "Product1")].change, -60)
+        self.assertEqual(self.diff.cells[("Region1", "Product2")].status, "removed")
+        self.assertEqual(self.diff.cells[("Region3", "Product2")].status, "added")
+        self.assertNotIn(("Region2", "Product2"), self.diff.cells)
+        self.assertEqual(self.diff.top_decliners("cell", 1)[0][0], ("Region1", "Product2"))
+
+    def test_totals_keep_int_types(self):
+        """Int snapshots diff to ints; empty regions still count as present"""
+        diff = diff_sales({"Empty": {}, "R": {"P": 1.5}}, {"Empty": {}, "R": {"P": 2}})
+        self.assertEqual(diff.regions["Empty"].status, "unchanged")
+        self.assertIsInstance(self.diff.products["Product1"].current, int)
+        self.assertEqual(diff.products["P"].change, 0.5)
+
+    def test_movers(self):
+        """Bounded heaps rank the biggest movers"""
+        movers = [name for name, _ in self.diff.biggest_movers("product", 2)]
+        self.assertEqual(movers, ["Product2", "Product1"])
+        self.assertEqual(self.diff.top_gainers("product", 1)[0][0], "Product3")
+        self.assertEqual(self.diff.top_decliners("region", 1)[0][0], "Region1")
+        with self.assertRaises(ValueError):
+            self.diff.biggest_movers("store")
+
+    def test_none_input(self):
+        with self.assertRaises(TypeError):
+            diff_sales(None, this_week)
+
+
+if __name__ == '__main__':
+    unittest.main()
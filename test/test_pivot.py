@@ -0,0 +1,55 @@
+import io
+import unittest
+
+from pivot import analyze_pivot, display_pivot
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestPivot(unittest.TestCase):
+    def setUp(self):
+        self.pivot = analyze_pivot(sales_data)
+
+    def test_margins(self):
+        """Row, column and grand totals come from the same scan"""
+        self.assertEqual(self.pivot.region_totals["West"], 300)
+        self.assertEqual(self.pivot.product_totals["Product C"], 165)
+        self.assertEqual(self.pivot.grand_total, 1020)
+
+    def test_shares(self):
+        """Each cell knows its share of region and product"""
+        self.assertAlmostEqual(self.pivot.region_share("North", "Product A"), 120 / 250)
+        self.assertAlmostEqual(self.pivot.product_share("North", "Product A"), 120 / 450)
+        for region, entries, _ in self.pivot.rows():
+            self.assertAlmostEqual(sum(entry[1] for entry in entries), 1.0)
+
+    def test_uneven_and_empty_regions(self):
+        """Missing cells count as zero and empty regions have zero shares"""
+        pivot = analyze_pivot({"EmptyRegion": {}, "ValidRegion": {"Product1": 100}})
+        self.assertEqual(pivot.amount("EmptyRegion", "Product1"), 0)
+        self.assertEqual(pivot.region_share("EmptyRegion", "Product1"), 0.0)
+
+    def test_display_streams_table(self):
+        """The table has one line per region plus headers and totals"""
+        out = io.StringIO()
+        display_pivot(self.pivot, "region_share", file=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn("Region x Product Pivot", lines[1])
+        self.assertTrue(lines[5].startswith("North"))
+        self.assertIn("48.0%", lines[5])
+        self.assertTrue(lines[-2].startswith("Total"))
+
+    def test_validation(self):
+        with self.assertRaises(TypeError):
+            analyze_pivot(None)
+        with self.assertRaises(ValueError):
+            analyze_pivot({"Region1": {"Product1": -100}})
+
+
+if __name__ == '__main__':
+    unittest.main()
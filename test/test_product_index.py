@@ -0,0 +1,45 @@
+import unittest
+
+from aggregation import SalesTotals
+from product_index import ProductIndex
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 15},
+    "West": {"Product A": 130, "Product B": 120}
+}
+
+
+class TestProductIndex(unittest.TestCase):
+    def test_inverse_of_sales_data(self):
+        """Every cell is reachable product-first"""
+        index = ProductIndex(sales_data)
+        self.assertEqual(dict(index.regions_for("Product C")), {"North": 45, "East": 15})
+        self.assertEqual(index.product_total("Product C"), 60)
+        self.assertEqual(index.product_results(), SalesTotals(sales_data).product_results())
+
+    def test_drill_down(self):
+        index = ProductIndex(sales_data)
+        self.assertEqual(index.drill_down("Product C"), [("North", 45, 0.75), ("East", 15, 0.25)])
+        with self.assertRaises(KeyError):
+            index.drill_down("Product Z")
+
+    def test_kept_in_sync_on_updates(self):
+        """Updates and removals change the index and totals together"""
+        index = ProductIndex(sales_data)
+        index.set_amount("South", "Product C", 40)
+        index.set_amount("North", "Product C", 5)
+        self.assertEqual(dict(index.regions_for("Product C")), {"North": 5, "East": 15, "South": 40})
+        self.assertEqual(index.product_total("Product C"), 60)
+        for region in ("North", "East", "South"):
+            index.remove_amount(region, "Product C")
+        self.assertNotIn("Product C", index.products)
+        self.assertNotIn("Product C", index.product_results())
+        with self.assertRaises(ValueError):
+            index.set_amount("North", "Product A", -1)
+        self.assertEqual(index.regions_for("Product A")["North"], 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
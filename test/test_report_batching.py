@@ -0,0 +1,146 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from test.TestUtils import TestUtils
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the results endpoint"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append(json.loads(body))
+        self.server.paths.append(self.path)
+        self.send_response(self.server.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestReportBatching(unittest.TestCase):
+    def setUp(self):
+        """Point TestUtils at a local server, a temp custom.ih and a temp spool"""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        self.server.received = []
+        self.server.paths = []
+        self.server.status = 200
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+        self.directory = tempfile.TemporaryDirectory()
+        custom_path = os.path.join(self.directory.name, "custom.ih")
+        with open(custom_path, "w") as ref:
+            ref.write("custom-data")
+
+        self.saved = {name: getattr(TestUtils, name) for name in
+                      ("URL", "BATCH_URL", "CUSTOM_DATA_PATH", "REPORT_MODE", "SPOOL_PATH",
+                       "_customData", "_session")}
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+        TestUtils.URL = f"{self.base}/push"
+        TestUtils.BATCH_URL = None
+        TestUtils.CUSTOM_DATA_PATH = custom_path
+        TestUtils.SPOOL_PATH = os.path.join(self.directory.name, "results.spool")
+        TestUtils._customData = None
+        TestUtils._session = None
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(TestUtils, name, value)
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def test_offline_mode_spools_without_requests(self):
+        """Offline mode only writes the spool"""
+        TestUtils.REPORT_MODE = "offline"
+        TestUtils.yakshaAssert("TestOne", True, "functional")
+        TestUtils.yakshaAssert("TestTwo", False, "boundary")
+        self.assertEqual(self.server.received, [])
+        with open(TestUtils.spoolFile()) as spool:
+            self.assertEqual(len(spool.readlines()), 2)
+
+    def test_flush_sends_one_batched_request(self):
+        """With a batch endpoint configured, all spooled results go out in a single POST"""
+        TestUtils.REPORT_MODE = "offline"
+        TestUtils.BATCH_URL = f"{self.base}/batch"
+        for index in range(5):
+            TestUtils.yakshaAssert(f"Test{index}", index % 2 == 0, "functional")
+        self.assertEqual(TestUtils.flushResults(), 5)
+        self.assertEqual(self.server.paths, ["/batch"])
+        batch = self.server.received[0]
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch[0]["customData"], "custom-data")
+        first = json.loads(batch[0]["testCaseResults"])[TestUtils.GUID]
+        self.assertEqual((first["methodName"], first["status"]), ("Test0", "Passed"))
+        self.assertEqual(os.listdir(self.directory.name), ["custom.ih"])
+
+    def test_flush_without_batch_url_posts_each_result(self):
+        """Without a batch endpoint, spooled payloads go to URL one by one"""
+        TestUtils.REPORT_MODE = "offline"
+        for index in range(3):
+            TestUtils.yakshaAssert(f"Test{index}", True, "functional")
+        self.assertEqual(TestUtils.flushResults(), 3)
+        self.assertEqual(self.server.paths, ["/push"] * 3)
+        self.assertTrue(all(isinstance(payload, dict) for payload in self.server.received))
+        self.assertEqual(TestUtils.spoolFiles(), [])
+
+    def run_suite(self, mode, env=None):
+        """Run two assertions in a separate process, like another test suite"""
+        script = (
+            "from test.TestUtils import TestUtils\n"
+            f"TestUtils.URL = {TestUtils.URL!r}\n"
+            f"TestUtils.CUSTOM_DATA_PATH = {TestUtils.CUSTOM_DATA_PATH!r}\n"
+            "TestUtils.yakshaAssert('TestOne', True, 'functional')\n"
+            "TestUtils.yakshaAssert('TestTwo', False, 'boundary')\n"
+        )
+        env = dict(os.environ, YAKSHA_REPORT_MODE=mode, YAKSHA_SPOOL_PATH=TestUtils.SPOOL_PATH, **(env or {}))
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", script], cwd=root, env=env, check=True, timeout=60)
+
+    def test_batch_mode_flushes_own_spool_at_exit(self):
+        """Batch mode posts its own spool at exit and leaves other suites' spools alone"""
+        TestUtils.REPORT_MODE = "offline"
+        TestUtils.yakshaAssert("OtherSuite", True, "functional")
+        self.run_suite("batch", {"YAKSHA_BATCH_URL": f"{self.base}/batch"})
+        self.assertEqual(self.server.paths, ["/batch"])
+        self.assertEqual(len(self.server.received[0]), 2)
+        self.assertEqual(TestUtils.spoolFiles(), [TestUtils.spoolFile()])
+
+    def test_flush_collects_every_process_spool(self):
+        """Suites spooling in separate processes each keep their own file"""
+        self.run_suite("offline")
+        self.run_suite("offline")
+        TestUtils.REPORT_MODE = "offline"
+        TestUtils.yakshaAssert("Local", True, "functional")
+        self.assertEqual(len(TestUtils.spoolFiles()), 3)
+        self.assertEqual(TestUtils.flushResults(), 5)
+        self.assertEqual(len(self.server.received), 5)
+        self.assertEqual(TestUtils.spoolFiles(), [])
+
+    def test_failed_flush_keeps_spool(self):
+        """A rejected batch stays on disk for a retry"""
+        TestUtils.REPORT_MODE = "offline"
+        TestUtils.yakshaAssert("TestOne", True, "functional")
+        self.server.status = 500
+        self.assertEqual(TestUtils.flushResults(), 0)
+        self.assertEqual(TestUtils.spoolFiles(), [TestUtils.spoolFile()])
+
+    def test_custom_data_read_once(self):
+        """custom.ih is cached after the first assertion"""
+        TestUtils.REPORT_MODE = "immediate"
+        TestUtils.yakshaAssert("TestOne", True, "functional")
+        os.remove(TestUtils.CUSTOM_DATA_PATH)
+        TestUtils.yakshaAssert("TestTwo", True, "functional")
+        self.assertEqual(len(self.server.received), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
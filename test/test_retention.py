@@ -0,0 +1,90 @@
+import datetime
+import random
+import unittest
+
+from retention import TieredSalesHistory, segment_end, segment_start
+
+
+def make_day(rng):
+    return {
+        region: {product: rng.randint(0, 50) for product in ("Product A", "Product B", "Product C")}
+        for region in ("North", "South", "East")
+    }
+
+
+def reference_totals(days, start, end):
+    regions = {}
+    products = {}
+    for day, sales_data in days.items():
+        if start <= day <= end:
+            for region, cells in sales_data.items():
+                regions[region] = regions.get(region, 0) + sum(cells.values())
+                for product, amount in cells.items():
+                    products[product] = products.get(product, 0) + amount
+    return regions, products
+
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.first = datetime.date(2023, 1, 1)
+        self.days = {self.first + datetime.timedelta(days=i): make_day(rng) for i in range(400)}
+        self.history = TieredSalesHistory(daily_days=14, weekly_weeks=8)
+        for day, sales_data in self.days.items():
+            self.history.add_day(day, sales_data)
+        self.last = max(self.days)
+
+    def test_memory_bounded(self):
+        """Only recent days and weeks stay at fine granularity"""
+        sizes = self.history.tier_sizes()
+        self.assertLessEqual(sizes["daily"], 14 + 6)
+        self.assertLessEqual(sizes["weekly"], 8 + 2 + 6)
+        self.assertEqual(sizes["monthly"], 14)
+
+    def test_ranges_are_exact(self):
+        """Aligned old ranges and arbitrary recent ranges match the raw data"""
+        ranges = [
+            (datetime.date(2023, 3, 1), datetime.date(2023, 9, 30)),
+            (self.first, self.last),
+            (self.last - datetime.timedelta(days=10), self.last),
+            (self.history.weekly_from, self.last),
+        ]
+        for start, end in ranges:
+            self.assertEqual(self.history.totals(start, end), reference_totals(self.days, start, end))
+
+    def test_coarsest_tier_used(self):
+        """Whole months come from the monthly tier, recent days from daily"""
+        tiers = [tier for tier, _, _ in self.history.buckets(datetime.date(2023, 1, 1), datetime.date(2023, 12, 31))]
+        self.assertEqual(tiers, ["monthly"] * 12)
+        recent = self.last - datetime.timedelta(days=2)
+        tiers = {tier for tier, _, _ in self.history.buckets(recent, self.last)}
+        self.assertEqual(tiers, {"daily"})
+        segment = segment_start(self.history.weekly_from + datetime.timedelta(days=10))
+        tiers = [tier for tier, _, _ in self.history.buckets(segment, segment_end(segment))]
+        self.assertEqual(tiers, ["weekly"])
+
+    def test_compacted_detail_rejected(self):
+        """Ranges needing compacted days raise instead of approximating"""
+        with self.assertRaises(ValueError):
+            self.history.totals(datetime.date(2023, 3, 15), datetime.date(2023, 3, 20))
+        february = datetime.date(2023, 2, 1), datetime.date(2023, 2, 28)
+        regions, products = reference_totals(self.days, *february)
+        regional = self.history.regional_results(*february)
+        self.assertEqual({r: t for r, (t, _) in regional.items()}, regions)
+        self.assertEqual(regional[max(regions, key=regions.get)][1], "Highest performing region")
+        self.assertEqual({p: t for p, (t, _) in self.history.product_results(*february).items()}, products)
+
+    def test_month_limit(self):
+        """max_months drops the oldest months entirely"""
+        history = TieredSalesHistory(daily_days=7, weekly_weeks=4, max_months=3)
+        for day, sales_data in self.days.items():
+            history.add_day(day, sales_data)
+        self.assertEqual(history.tier_sizes()["monthly"], 3)
+        with self.assertRaises(ValueError):
+            history.totals(self.first, self.last)
+        with self.assertRaises(ValueError):
+            history.add_day(self.first, make_day(random.Random(1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+
+from aggregation import SalesTotals
+from rolling_window import RollingWindow, RollingWindows
+
+
+def make_day(rng):
+    regions = ["North", "South", "East", "West"]
+    products = ["Product A", "Product B", "Product C", "Product D"]
+    return {
+        region: {product: rng.randint(0, 20) for product in products if rng.random() < 0.8}
+        for region in regions if rng.random() < 0.9
+    }
+
+
+def batch_window(days):
+    """Reference: aggregate every day in the window from scratch"""
+    region_totals = {}
+    product_totals = {}
+    for day in days:
+        for region, products in day.items():
+            region_totals[region] = region_totals.get(region, 0) + sum(products.values())
+            for product, amount in products.items():
+                product_totals[product] = product_totals.get(product, 0) + amount
+    return region_totals, product_totals
+
+
+class TestRollingWindow(unittest.TestCase):
+    def test_slide_matches_recompute(self):
+        """Window totals and labels equal a full recompute after every slide"""
+        rng = random.Random(12)
+        window = RollingWindow(7)
+        days = []
+        for _ in range(60):
+            day = make_day(rng)
+            days.append(day)
+            window.push(day)
+            region_totals, product_totals = batch_window(days[-7:])
+            regional = window.regional_results()
+            self.assertEqual({r: t for r, (t, _) in regional.items()}, region_totals)
+            self.assertEqual({p: t for p, (t, _) in window.product_results().items()}, product_totals)
+
+            highest = max(region_totals.values())
+            lowest = min(region_totals.values())
+            labels = {label: region for region, (_, label) in regional.items() if label}
+            self.assertEqual(region_totals[labels["Highest performing region"]], highest)
+            if len(region_totals) > 1 and "Lowest performing region" in labels:
+                self.assertEqual(region_totals[labels["Lowest performing region"]], lowest)
+            products = window.product_results()
+            self.assertEqual(products[window.top_product()][0], max(product_totals.values()))
+        self.assertEqual(len(window), 7)
+
+    def test_labels_match_batch_for_fixed_data(self):
+        """With a full window of one dataset the labels match the batch rules"""
+        sales_data = {
+            "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+            "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+            "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+        }
+        window = RollingWindow(2)
+        window.push(sales_data)
+        expected = SalesTotals(sales_data)
+        self.assertEqual(window.regional_results(), expected.regional_results())
+        self.assertEqual(window.product_results(), expected.product_results())
+
+    def test_multiple_sizes_share_reduction(self):
+        """7- and 30-period windows see the same stream"""
+        windows = RollingWindows((2, 3))
+        for amount in (10, 20, 30, 40):
+            windows.push({"North": {"Product A": amount}})
+        self.assertEqual(windows[2].regional_results()["North"][0], 70)
+        self.assertEqual(windows[3].regional_results()["North"][0], 90)
+        with self.assertRaises(ValueError):
+            RollingWindow(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+from aggregation import SalesTotals
+from scenarios import Scenario, ScenarioEngine
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+def apply_scenario(data, scenario):
+    """Reference: scale a copy of the nested dict"""
+    return {
+        region: {product: amount * scenario.regions.get(region, 1.0) * scenario.products.get(product, 1.0)
+                 for product, amount in products.items()}
+        for region, products in data.items()
+    }
+
+
+class TestScenarioEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = ScenarioEngine(sales_data)
+
+    def test_matches_modified_copy(self):
+        """Batched totals equal analysing a scaled copy of the data"""
+        scenarios = [
+            Scenario("north up", regions={"North": 1.05}, products={"Product C": 0.9}),
+            Scenario("south boom", regions={"South": 1.4}),
+            Scenario("b surge", products={"Product B": 1.2}),
+        ]
+        for scenario, result in zip(scenarios, self.engine.evaluate(scenarios)):
+            expected = SalesTotals(apply_scenario(sales_data, scenario))
+            for name, (total, label) in expected.regional_results().items():
+                self.assertAlmostEqual(result.regional[name][0], total)
+                self.assertEqual(result.regional[name][1], label)
+            for name, (total, label) in expected.product_results().items():
+                self.assertAlmostEqual(result.products[name][0], total)
+                self.assertEqual(result.products[name][1], label)
+
+    def test_unchanged_totals_keep_int_types(self):
+        """Multipliers of 1 leave the baseline's int totals untouched"""
+        self.assertEqual(self.engine.baseline.regional["North"][0], 250)
+        self.assertIsInstance(self.engine.baseline.regional["North"][0], int)
+        same, product_only = self.engine.evaluate([
+            Scenario("same", regions={"North": 1}, products={"Product A": 1.0}),
+            Scenario("c only", products={"Product C": 2}),
+        ])
+        self.assertEqual(same.regional, self.engine.baseline.regional)
+        self.assertEqual(same.products, self.engine.baseline.products)
+        self.assertTrue(all(isinstance(total, int) for total, _ in same.regional.values()))
+        self.assertIsInstance(product_only.products["Product A"][0], int)
+        self.assertEqual(product_only.products["Product C"][0], 330)
+
+    def test_label_shifts(self):
+        """Only labels that change hands are reported"""
+        results = self.engine.evaluate([
+            Scenario("same"),
+            Scenario("south boom", regions={"South": 1.4}),
+        ])
+        shifts = self.engine.label_shifts(results)
+        self.assertEqual(shifts["same"], {})
+        self.assertEqual(shifts["south boom"]["Highest performing region"], ("West", "South"))
+        self.assertEqual(shifts["south boom"]["Lowest performing region"], ("South", "East"))
+
+    def test_invalid_scenarios(self):
+        """Unknown names and negative multipliers are rejected"""
+        with self.assertRaises(KeyError):
+            self.engine.evaluate([Scenario("bad", regions={"Nowhere": 1.1})])
+        with self.assertRaises(ValueError):
+            Scenario("bad", products={"Product A": -1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import unittest
+from multiprocessing import shared_memory
+
+from aggregation import SalesTotals
+from sales_matrix import SalesMatrix
+from shared_dataset import SharedSalesDataset, parallel_analyze
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+uneven_sales = {
+    "Region1": {"Product1": 100, "Product2": 200.5},
+    "Region2": {"Product1": 150},
+    "EmptyRegion": {}
+}
+
+
+class TestSharedDataset(unittest.TestCase):
+    def test_matrix_round_trip_keeps_types(self):
+        """Missing cells stay missing and ints stay ints"""
+        matrix = SalesMatrix.from_sales_data(uneven_sales)
+        self.assertEqual(matrix.to_sales_data(), uneven_sales)
+        self.assertIsInstance(matrix.row_totals()["Region2"], int)
+        self.assertEqual(matrix.column_totals(), {"Product1": 250, "Product2": 200.5})
+
+    def test_matrix_rejects_inexact_ints(self):
+        """Ints beyond float64 precision raise instead of being rounded"""
+        with self.assertRaises(OverflowError):
+            SalesMatrix.from_sales_data({"R": {"P": 2 ** 60 + 1}})
+        matrix = SalesMatrix.from_sales_data({"R": {"P": 2 ** 53}})
+        self.assertEqual(matrix.row_totals(), {"R": 2 ** 53})
+
+    def test_attached_results_match_batch(self):
+        """Workers attaching by name see the published dataset"""
+        with SharedSalesDataset.publish(uneven_sales) as dataset:
+            attached = SharedSalesDataset.attach(dataset.name)
+            expected = SalesTotals(uneven_sales)
+            self.assertEqual(attached.regional_results(), expected.regional_results())
+            self.assertEqual(attached.product_results(), expected.product_results())
+            attached.close()
+
+    def test_parallel_analyze_matches_batch(self):
+        """Process-pool aggregation merges shards into the batch results"""
+        with SharedSalesDataset.publish(sales_data) as dataset:
+            regional, products = parallel_analyze(dataset, workers=2)
+        expected = SalesTotals(sales_data)
+        self.assertEqual(regional, expected.regional_results())
+        self.assertEqual(products, expected.product_results())
+
+    def test_separate_process_attach_leaves_block(self):
+        """A process attaching by name and exiting does not unlink the publisher's block"""
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        with SharedSalesDataset.publish(sales_data) as dataset:
+            script = ("from shared_dataset import SharedSalesDataset\n"
+                      f"dataset = SharedSalesDataset.attach({dataset.name!r})\n"
+                      "print(dataset.regional_results()['West'][0])\n"
+                      "dataset.close()\n")
+            completed = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True,
+                                       text=True, check=True, timeout=60)
+            self.assertEqual(completed.stdout.strip(), "300")
+            self.assertNotIn("leaked", completed.stderr)
+            self.assertNotIn("Traceback", completed.stderr)
+            again = shared_memory.SharedMemory(name=dataset.name, create=False)
+            again.close()
+            self.assertEqual(dataset.regional_results(), SalesTotals(sales_data).regional_results())
+
+    def test_owner_close_unlinks_block(self):
+        """Closing the publisher removes the shared memory block"""
+        dataset = SharedSalesDataset.publish(sales_data)
+        name = dataset.name
+        dataset.close()
+        dataset.close()
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
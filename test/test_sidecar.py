@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import sidecar
+from aggregation import SalesTotals
+from sales_file import write_sales_file
+from sidecar import SidecarRebuilder, load_results, rebuild_sidecar, sidecar_path
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45.5},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestSidecar(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sales.csv")
+        write_sales_file(self.path, sales_data)
+        expected = SalesTotals(sales_data)
+        self.expected = expected.regional_results(), expected.product_results()
+
+    def test_valid_sidecar_skips_aggregation(self):
+        """A matching sidecar is returned without parsing the export"""
+        self.assertEqual(load_results(self.path, background=False), self.expected)
+        self.assertTrue(os.path.exists(sidecar_path(self.path)))
+        with mock.patch.object(sidecar, "compute_results") as compute:
+            regional, products = load_results(self.path)
+        compute.assert_not_called()
+        self.assertEqual((regional, products), self.expected)
+        self.assertEqual(list(products), list(self.expected[1]))
+        self.assertIsInstance(regional["North"][0], float)
+
+    def test_changed_export_invalidates(self):
+        """A new checksum makes the old sidecar stale"""
+        load_results(self.path, background=False)
+        changed = dict(sales_data, East={"Product A": 500})
+        write_sales_file(self.path, changed)
+        expected = SalesTotals(changed)
+        self.assertEqual(load_results(self.path, background=False),
+                         (expected.regional_results(), expected.product_results()))
+        self.assertFalse(rebuild_sidecar(self.path))
+
+    def test_export_read_once(self):
+        """The checksum and the parse come from the same single read"""
+        with mock.patch.object(sidecar, "read_export", wraps=sidecar.read_export) as read:
+            self.assertEqual(load_results(self.path, background=False), self.expected)
+        read.assert_called_once_with(self.path)
+        _, checksum = sidecar.read_export(self.path)
+        self.assertEqual(checksum, sidecar.file_checksum(self.path))
+
+    def test_malformed_sidecar_is_ignored(self):
+        """Entries of the wrong shape make the sidecar stale instead of raising"""
+        load_results(self.path, background=False)
+        checksum = sidecar.file_checksum(self.path)
+        for regional in ([["North", 1]], [7], None):
+            sidecar.write_sidecar(self.path, checksum, {}, {})
+            with open(sidecar_path(self.path)) as file:
+                document = file.read().replace('"regional":[]', '"regional":' + json.dumps(regional))
+            with open(sidecar_path(self.path), "w") as file:
+                file.write(document)
+            self.assertIsNone(sidecar.read_sidecar(self.path, checksum))
+            self.assertEqual(load_results(self.path, background=False), self.expected)
+
+    def test_background_rebuilder(self):
+        """The rebuilder writes missing sidecars and records failures"""
+        missing = self.path + ".missing"
+        rebuilder = SidecarRebuilder([self.path, missing], interval=60)
+        with rebuilder:
+            pass
+        self.assertEqual(rebuilder.rebuilt, 1)
+        self.assertIn(missing, rebuilder.errors)
+        self.assertEqual(rebuilder.check(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
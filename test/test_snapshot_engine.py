@@ -0,0 +1,69 @@
+import threading
+import unittest
+
+from snapshot_engine import SnapshotEngine
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+class TestSnapshotEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = SnapshotEngine(sales_data)
+
+    def test_results_match_expected_labels(self):
+        """Snapshot results follow the analysis function contract"""
+        regional = self.engine.analyze_regional_sales()
+        self.assertEqual(regional["West"], (300, "Highest performing region"))
+        self.assertEqual(regional["South"], (235, "Lowest performing region"))
+        products = self.engine.analyze_product_performance()
+        self.assertEqual(products["Product A"], (450, "Top product"))
+        self.assertEqual(products["Product C"], (165, "Bottom product"))
+
+    def test_snapshots_are_immutable_and_versioned(self):
+        """Old snapshots keep their values after new updates are published"""
+        before = self.engine.snapshot()
+        after = self.engine.apply([("North", "Product A", 200), ("South", "Product D", 5)])
+        self.assertEqual(after.version, before.version + 1)
+        self.assertEqual(before.region_totals["North"], 250)
+        self.assertEqual(after.region_totals["North"], 330)
+        with self.assertRaises(TypeError):
+            before.region_totals["North"] = 0
+
+    def test_invalid_batch_is_not_published(self):
+        """A batch with a bad amount leaves the current version untouched"""
+        version = self.engine.version
+        with self.assertRaises(ValueError):
+            self.engine.apply([("North", "Product A", 1), ("North", "Product B", -1)])
+        self.assertEqual(self.engine.version, version)
+        self.assertEqual(self.engine.snapshot().region_totals["North"], 250)
+
+    def test_readers_never_see_partial_updates(self):
+        """Region and product grand totals agree in every snapshot read"""
+        stop = threading.Event()
+        failures = []
+
+        def reader():
+            while not stop.is_set():
+                snapshot = self.engine.snapshot()
+                if sum(snapshot.region_totals.values()) != sum(snapshot.product_totals.values()):
+                    failures.append(snapshot.version)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(2000):
+            self.engine.apply([("North", "Product A", i), ("West", "Product C", i * 2)])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+        self.assertEqual(self.engine.version, 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()
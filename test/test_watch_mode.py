@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+from aggregation import SalesTotals, label_products, label_regions
+from sales_file import parse_amount, write_sales_file
+from watch_mode import SalesFileWatcher
+
+sales_data = {
+    "North": {"Product A": 120, "Product B": 85, "Product C": 45},
+    "South": {"Product A": 95, "Product B": 110, "Product C": 30},
+    "East": {"Product A": 105, "Product B": 90, "Product C": 40},
+    "West": {"Product A": 130, "Product B": 120, "Product C": 50}
+}
+
+
+def batch_results(data):
+    """Recompute both analyses from scratch for comparison"""
+    region_totals = {region: sum(products.values()) for region, products in data.items()}
+    product_totals = {}
+    for products in data.values():
+        for product, amount in products.items():
+            product_totals[product] = product_totals.get(product, 0) + amount
+    return label_regions(region_totals), label_products(product_totals)
+
+
+class TestWatchMode(unittest.TestCase):
+    def setUp(self):
+        """Write the sample data to a temporary export"""
+        handle, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        write_sales_file(self.path, sales_data)
+        self.rendered = []
+        self.watcher = SalesFileWatcher(self.path, display=lambda results, kind: self.rendered.append((kind, results)))
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def bump_mtime(self):
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+    def test_initial_load_matches_batch(self):
+        """The first refresh should match a full aggregation"""
+        regional, products = batch_results(sales_data)
+        self.assertEqual(self.watcher.totals.regional_results(), regional)
+        self.assertEqual(self.watcher.totals.product_results(), products)
+
+    def test_append_reads_only_new_lines(self):
+        """Appended cells are applied from the previous offset"""
+        offset = self.watcher.offset
+        with open(self.path, "a") as file:
+            file.write("South,Product C,80\nCentral,Product D,10\nCentral,Prod")
+        self.assertEqual(self.watcher.refresh(), 2)
+        self.assertGreater(self.watcher.offset, offset)
+
+        with open(self.path, "a") as file:
+            file.write("uct A,5\n")
+        self.bump_mtime()
+        self.assertEqual(self.watcher.refresh(), 1)
+
+        expected = {region: dict(products) for region, products in sales_data.items()}
+        expected["South"]["Product C"] = 80
+        expected["Central"] = {"Product D": 10, "Product A": 5}
+        regional, products = batch_results(expected)
+        self.assertEqual(self.watcher.totals.regional_results(), regional)
+        self.assertEqual(self.watcher.totals.product_results(), products)
+
+    def test_rewrite_applies_only_changed_cells(self):
+        """A rewritten export is diffed against the cached cells"""
+        rewritten = {region: dict(products) for region, products in sales_data.items() if region != "East"}
+        rewritten["North"]["Product A"] = 10
+        del rewritten["West"]["Product C"]
+        write_sales_file(self.path, rewritten)
+        self.bump_mtime()
+        self.assertEqual(self.watcher.refresh(), 5)
+
+        regional, products = batch_results(rewritten)
+        self.assertEqual(self.watcher.totals.regional_results(), regional)
+        self.assertEqual(self.watcher.totals.product_results(), products)
+
+    def test_same_length_rewrite_is_not_an_append(self):
+        """Rewriting an early row in place is picked up even if the size is unchanged"""
+        rewritten = {region: dict(products) for region, products in sales_data.items()}
+        rewritten["North"]["Product A"] = 130
+        write_sales_file(self.path, rewritten)
+        self.bump_mtime()
+        self.assertEqual(self.watcher.refresh(), 1)
+        self.assertEqual(self.watcher.totals.region_totals["North"], 260)
+
+        rewritten["North"]["Product A"] = 999
+        rewritten["Central"] = {"Product D": 1}
+        write_sales_file(self.path, rewritten)
+        self.bump_mtime()
+        self.assertEqual(self.watcher.refresh(), 2)
+        regional, products = batch_results(rewritten)
+        self.assertEqual(self.watcher.totals.regional_results(), regional)
+        self.assertEqual(self.watcher.totals.product_results(), products)
+
+    def test_full_read_keeps_unterminated_last_line(self):
+        """Loading or rewriting a file without a trailing newline parses every row"""
+        with open(self.path, "w") as file:
+            file.write("North,Product A,10\nSouth,Product A,5")
+        watcher = SalesFileWatcher(self.path, display=lambda results, kind: None)
+        self.assertEqual(watcher.totals.region_totals, {"North": 10, "South": 5})
+
+        with open(self.path, "w") as file:
+            file.write("South,Product A,7\nNorth,Product A,10\nEast,Product B,1")
+        self.bump_mtime()
+        self.assertEqual(watcher.refresh(), 2)
+        self.assertEqual(watcher.totals.region_totals, {"North": 10, "South": 7, "East": 1})
+
+        with open(self.path, "a") as file:
+            file.write("0\nWest,Product C,3\n")
+        self.assertEqual(watcher.refresh(), 2)
+        self.assertEqual(watcher.totals.region_totals, {"North": 10, "South": 7, "East": 10, "West": 3})
+
+    def test_watch_renders_through_display(self):
+        """Each change is re-rendered for both analysis types"""
+        self.watcher.watch(interval=0, max_polls=1)
+        kinds = [kind for kind, _ in self.rendered]
+        self.assertEqual(kinds, ["Regional Sales Analysis", "Product Performance Analysis"])
+
+    def test_invalid_amount_is_rejected(self):
+        """Deltas go through the same validation as the analyses"""
+        totals = SalesTotals()
+        with self.assertRaises(ValueError):
+            totals.set_amount("North", "Product A", -1)
+        with self.assertRaises(TypeError):
+            totals.set_amount("North", "Product A", "100")
+        for amount in (float("nan"), float("inf")):
+            with self.assertRaises(ValueError):
+                totals.set_amount("North", "Product A", amount)
+        for text in ("nan", "inf", "-inf"):
+            with self.assertRaises(ValueError):
+                parse_amount(text)
+
+
+if __name__ == '__main__':
+    unittest.main()
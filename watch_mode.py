@@ -0,0 +1,167 @@
+"""
+Watch mode for the console app.
+
+Polls a sales export's mtime and size and keeps cached regional and product
+totals up to date. A file that grew and whose already consumed bytes hash the
+same as before is treated as an append: new lines are read from the last
+consumed offset and applied as deltas. Anything else is a rewrite: the file
+is re-parsed and only the cells whose amount changed are applied. Results are
+re-rendered through display_results.
+"""
+
+import hashlib
+import os
+import sys
+import time
+
+from aggregation import SalesTotals
+from sales_file import parse_sales_lines
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class SalesFileWatcher:
+    """Incrementally track a sales export on disk"""
+
+    def __init__(self, path, display=None):
+        self.path = path
+        self.totals = SalesTotals()
+        self.display = display
+        self.offset = 0
+        self.size = -1
+        self.mtime_ns = None
+        self._consumed_hash = hashlib.sha256()
+        self.refresh()
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def has_changed(self):
+        """Check whether mtime or size differ from the last refresh"""
+        return self._stat() != (self.size, self.mtime_ns)
+
+    def _prefix_digest(self, file):
+        """SHA-256 of the bytes [0, offset) as they are on disk now"""
+        digest = hashlib.sha256()
+        file.seek(0)
+        remaining = self.offset
+        while remaining:
+            chunk = file.read(min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+        return digest.digest()
+
+    def _is_append(self, file, size):
+        """Only a grown file whose whole consumed prefix is unchanged is an append"""
+        if self.size < 0 or size <= self.size:
+            return False
+        return self._prefix_digest(file) == self._consumed_hash.digest()
+
+    def _consume(self, file, start):
+        """
+        Read lines from start
+        The offset only advances past complete lines. An append leaves a
+        partial last line for the next refresh; a full read from the
+        beginning also parses it, and it is read again if it is later
+        completed (setting a cell is idempotent)
+        """
+        file.seek(start)
+        chunk = file.read()
+        complete = chunk.rfind(b"\n") + 1
+        if start == 0:
+            self._consumed_hash = hashlib.sha256()
+        self._consumed_hash.update(chunk[:complete])
+        self.offset = start + complete
+        lines = chunk[:len(chunk) if start == 0 else complete].decode("utf-8").splitlines()
+        return parse_sales_lines(lines)
+
+    def _apply_append(self, file):
+        changed = 0
+        for region, product, amount in self._consume(file, self.offset):
+            self.totals.set_amount(region, product, amount)
+            changed += 1
+        return changed
+
+    def _apply_rewrite(self, file):
+        latest = {}
+        for region, product, amount in self._consume(file, 0):
+            latest.setdefault(region, {})[product] = amount
+
+        changed = 0
+        for region, products in list(self.totals.cells.items()):
+            for product in list(products):
+                if product not in latest.get(region, {}):
+                    self.totals.remove_amount(region, product)
+                    changed += 1
+            if region not in latest:
+                del self.totals.cells[region]
+                del self.totals.region_totals[region]
+        for region, products in latest.items():
+            current = self.totals.cells.get(region, {})
+            for product, amount in products.items():
+                if product not in current or current[product] != amount:
+                    self.totals.set_amount(region, product, amount)
+                    changed += 1
+        return changed
+
+    def refresh(self):
+        """
+        Apply whatever changed on disk since the last refresh
+        Return: number of cells added, updated or removed
+        """
+        size, mtime_ns = self._stat()
+        if (size, mtime_ns) == (self.size, self.mtime_ns):
+            return 0
+        with open(self.path, "rb") as file:
+            if self._is_append(file, size):
+                changed = self._apply_append(file)
+            else:
+                changed = self._apply_rewrite(file)
+        self.size, self.mtime_ns = size, mtime_ns
+        return changed
+
+    def render(self):
+        """Display the cached results through display_results"""
+        display = self.display
+        if display is None:
+            from skeleton import display_results as display
+        display(self.totals.regional_results(), "Regional Sales Analysis")
+        display(self.totals.product_results(), "Product Performance Analysis")
+
+    def watch(self, interval=2.0, max_polls=None):
+        """Poll the file and re-render after every change"""
+        self.render()
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            time.sleep(interval)
+            polls += 1
+            if self.has_changed() and self.refresh():
+                self.render()
+
+
+def main(argv=None):
+    """Run watch mode: python watch_mode.py <sales.csv> [interval_seconds]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python watch_mode.py <sales.csv> [interval_seconds]")
+        return 1
+    try:
+        interval = float(argv[1]) if len(argv) > 1 else 2.0
+    except ValueError:
+        print("Invalid interval. Please enter a number of seconds.")
+        return 1
+    try:
+        SalesFileWatcher(argv[0]).watch(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())